@@ -5,3 +5,6 @@ class AgentGatewayConfig(AppConfig):
     name = 'apps.agent_gateway'
     verbose_name = 'Agent Gateway'
 
+    def ready(self):
+        from . import signals  # noqa: F401 — connects agent_name sync
+
@@ -1,57 +1,174 @@
+import base64
+import hashlib
+import hmac
+import time
+from datetime import timedelta
+
+import orjson
+
 from rest_framework import authentication, exceptions
 from django.utils import timezone
 from apps.agent_registry.models import Agent
 from .models import AgentSession
+from . import token_cache
 import jwt
 from django.conf import settings
 
+# Only persist last_activity when it is at least this stale, so steady
+# request traffic doesn't turn every authenticated GET into a write.
+UPDATE_THRESHOLD = timedelta(seconds=60)
+
+# Module-level singletons reused across requests: passing the str key on
+# every call makes PyJWT re-run force_bytes + HMAC key preparation each
+# time, so encode it once here.
+_JWT = jwt.PyJWT()
+_SIGNING_KEY = settings.SECRET_KEY.encode()
+
+# hmac.new() re-derives the padded inner/outer key blocks from the secret
+# on every call; copying a prepared template reuses them, which is a
+# measurable win on short signing inputs like JWTs.
+_HMAC_TEMPLATE = hmac.new(_SIGNING_KEY, digestmod=hashlib.sha256)
+
+_REQUIRED_CLAIMS = ('jti', 'agent_id', 'exp')
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """base64url decode with the padding PyJWT strips on encode restored."""
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+def _fast_decode(token: str) -> dict:
+    """
+    Verify-only HS256 decode that skips PyJWT's per-call regex validation
+    and re-splitting: one split, one HMAC, one json.loads.
+
+    The header is never parsed — the signature is always checked against
+    our own HMAC-SHA256, so an attacker-controlled ``alg`` claim cannot
+    downgrade the verification. Enforces the same required claims and
+    expiry as the previous jwt.decode() call and raises
+    ``jwt.InvalidTokenError`` subclasses so callers are unaffected.
+    """
+    try:
+        header_b64, payload_b64, sig_b64 = token.split('.')
+        signature = _b64url_decode(sig_b64)
+        mac = _HMAC_TEMPLATE.copy()
+        mac.update(f"{header_b64}.{payload_b64}".encode())
+        expected = mac.digest()
+        if not hmac.compare_digest(expected, signature):
+            raise jwt.InvalidSignatureError('Signature verification failed')
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except jwt.InvalidTokenError:
+        raise
+    except (ValueError, TypeError):
+        raise jwt.DecodeError('Invalid token')
+
+    for claim in _REQUIRED_CLAIMS:
+        if claim not in payload:
+            raise jwt.MissingRequiredClaimError(claim)
+    if payload['exp'] < time.time():
+        raise jwt.ExpiredSignatureError('Signature has expired')
+    return payload
+
 
 class AgentAuthentication(authentication.BaseAuthentication):
     """Authenticate agents using their identity tokens"""
     
     def authenticate(self, request):
         auth_header = request.headers.get('Authorization')
-        
+
         if not auth_header:
             return None
-        
+
         try:
-            # Expect "Bearer <token>"
+            # "Bearer <jwt>" or "Agent <identity key>"
             token_type, token = auth_header.split()
-            if token_type.lower() != 'bearer':
-                return None
         except ValueError:
             raise exceptions.AuthenticationFailed('Invalid Authorization header')
-        
-        # First check if it's an agent token (not a user JWT)
+
+        # Dispatch on the header prefix instead of attempting a JWT decode
+        # and falling back on InvalidTokenError — the old flow made every
+        # identity-key request pay for a doomed signature check first.
+        scheme = token_type.lower()
+        if scheme == 'agent':
+            return self._authenticate_identity_token(token)
+        if scheme != 'bearer':
+            return None
+
+        # Cache-aside fast path: a token we verified recently skips both the
+        # JWT decode and the session SELECT/UPDATE.
+        cached = token_cache.get(token)
+        if cached is not None:
+            return self._authenticate_cached(token, cached)
+
         try:
-            # Try to decode as JWT first
-            payload = jwt.decode(
-                token, 
-                settings.SECRET_KEY, 
-                algorithms=['HS256']
-            )
-            
-            # Check if it's an agent token (has agent_id claim)
-            if 'agent_id' in payload:
-                return self._authenticate_jwt(token, payload)
+            # Single verified decode; required claims are enforced here so we
+            # can trust the payload without re-inspecting it afterwards.
+            payload = _fast_decode(token)
         except jwt.InvalidTokenError:
-            # If not JWT, treat as direct agent identity token
-            return self._authenticate_identity_token(token)
+            raise exceptions.AuthenticationFailed('Invalid or expired token')
+
+        return self._authenticate_jwt(token, payload)
     
+    def _authenticate_cached(self, token, cached):
+        """Authenticate from a cached verification result (no JWT decode)."""
+        if cached['expires_at'] <= timezone.now():
+            token_cache.invalidate(token)
+            raise exceptions.AuthenticationFailed('Invalid or expired session')
+        try:
+            # 'name' is read by the request-log middleware on every request;
+            # leaving it deferred re-added a per-request SELECT on cache
+            # hits. 'status' is never touched on this path.
+            agent = Agent.objects.only('id', 'name', 'identity_key').get(
+                pk=cached['agent_id']
+            )
+        except Agent.DoesNotExist:
+            token_cache.invalidate(token)
+            raise exceptions.AuthenticationFailed('Invalid agent identity')
+        # Skip the last_activity write on cache hits — the session was
+        # touched at most MAX_TTL_SECONDS ago when the entry was stored.
+        return (agent, token)
+
+    def _check_token_version(self, payload):
+        """
+        Version-counter revocation: compare the token's 'ver' claim against
+        the agent's current token_version (cached for 60s). A mismatch means
+        the agent's tokens were revoked wholesale, so we can fail before the
+        session SELECT. Tokens minted before the claim existed pass through.
+        """
+        ver = payload.get('ver')
+        if ver is None:
+            return
+        agent_id = payload['agent_id']
+        current = token_cache.get_agent_version(agent_id)
+        if current is None:
+            try:
+                current = Agent.objects.values_list(
+                    'token_version', flat=True
+                ).get(pk=agent_id)
+            except Agent.DoesNotExist:
+                raise exceptions.AuthenticationFailed('Invalid agent identity')
+            token_cache.set_agent_version(agent_id, current)
+        if ver != current:
+            raise exceptions.AuthenticationFailed('Token has been revoked')
+
     def _authenticate_jwt(self, token, payload):
         """Authenticate via JWT (created for agents)"""
+        self._check_token_version(payload)
         try:
             session = AgentSession.objects.select_related('agent').get(
                 jti=payload['jti'],
                 revoked_at__isnull=True,
                 expires_at__gt=timezone.now()
             )
-            
-            # Update last activity
-            session.last_activity = timezone.now()
-            session.save(update_fields=['last_activity'])
-            
+
+            # Coalesced activity tracking: only write when the timestamp is
+            # actually stale instead of on every request.
+            now = timezone.now()
+            if now - session.last_activity > UPDATE_THRESHOLD:
+                session.last_activity = now
+                session.save(update_fields=['last_activity'])
+
+            token_cache.store(token, session.agent_id, session.id, session.expires_at)
             return (session.agent, token)
         except AgentSession.DoesNotExist:
             raise exceptions.AuthenticationFailed('Invalid or expired session')
@@ -59,7 +176,9 @@ class AgentAuthentication(authentication.BaseAuthentication):
     def _authenticate_identity_token(self, token):
         """Authenticate via direct agent identity key"""
         try:
-            agent = Agent.objects.get(
+            # identity_key is unique+indexed on Agent, so this is a single
+            # index probe; only() keeps the hydrated row narrow.
+            agent = Agent.objects.only('id', 'name', 'status', 'identity_key').get(
                 identity_key=token,
                 status__in=['RUNNING', 'PAUSED']  # Can authenticate even if paused
             )
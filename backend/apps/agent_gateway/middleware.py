@@ -0,0 +1,89 @@
+"""
+Request logging for agent traffic.
+
+AgentRequestLog rows used to be a synchronous, JSON-heavy INSERT per
+request. The middleware instead serializes the log entry with orjson and
+LPUSHes it onto a Redis list; a Celery beat task drains the list with a
+single bulk_create (see tasks.flush_request_logs). Logging must never
+take down the request, so Redis failures are swallowed and logged.
+"""
+import logging
+import time
+
+import orjson
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "agent_req_log"
+
+_redis_client = None
+
+
+def get_redis_client():
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.CELERY_BROKER_URL)
+    return _redis_client
+
+
+def drain_queue(client, key, count):
+    """
+    Atomically pop up to *count* entries from the tail of a buffer list,
+    oldest first. Shared by every flush task that consumes an LPUSH buffer.
+
+    Producers push onto the head, so a single RPOP from the tail is the
+    only safe drain: the head-end LRANGE + LTRIM sequence races with
+    concurrent pushes — an entry pushed between the two calls gets trimmed
+    away unread, and an already-read one survives to duplicate on the next
+    tick.
+    """
+    return client.rpop(key, count) or []
+
+
+class AgentRequestLogMiddleware:
+    """Buffer AgentRequestLog entries in Redis instead of writing per request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+
+        # Only log traffic from authenticated agents. AgentAuthentication
+        # returns (agent, token), which DRF propagates onto the request.
+        from apps.agent_registry.models import Agent
+
+        user = getattr(request, "user", None)
+        if isinstance(user, Agent):
+            self._enqueue(request, response, user, start)
+        return response
+
+    def _enqueue(self, request, response, agent, start):
+        try:
+            body = None
+            if request.content_type == "application/json" and request.body:
+                body = orjson.loads(request.body)
+        except Exception:
+            body = None
+
+        entry = {
+            "agent_id": str(agent.id),
+            "agent_name": agent.name,
+            "method": request.method,
+            "path": request.path[:500],
+            "query_params": dict(request.GET.items()),
+            "headers": {
+                k: v for k, v in request.headers.items()
+                if k.lower() != "authorization"
+            },
+            "body": body,
+            "response_status": response.status_code,
+            "duration_ms": int((time.perf_counter() - start) * 1000),
+        }
+        try:
+            get_redis_client().lpush(QUEUE_KEY, orjson.dumps(entry))
+        except Exception:
+            logger.exception("Failed to enqueue agent request log")
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-08-26 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agent_gateway', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='agentsession',
+            name='agent_gatew_jti_dab6bf_idx',
+        ),
+        migrations.AddIndex(
+            model_name='agentsession',
+            index=models.Index(
+                condition=models.Q(('revoked_at__isnull', True)),
+                fields=['jti'],
+                include=('agent', 'expires_at', 'last_activity'),
+                name='idx_agentsession_active_jti',
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-08-26 09:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agent_gateway', '0002_agentsession_active_jti_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='agentsession',
+            name='last_activity',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-08-26 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agent_gateway', '0003_alter_agentsession_last_activity'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='agentrequestlog',
+            name='query_params',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='agentrequestlog',
+            name='headers',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-08-26 10:48
+
+from django.db import migrations, models
+
+
+def backfill_agent_name(apps, schema_editor):
+    AgentSession = apps.get_model('agent_gateway', 'AgentSession')
+    AgentRequestLog = apps.get_model('agent_gateway', 'AgentRequestLog')
+    for model in (AgentSession, AgentRequestLog):
+        for row in model.objects.select_related('agent').iterator():
+            model.objects.filter(pk=row.pk).update(agent_name=row.agent.name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agent_gateway', '0004_agentrequestlog_nullable_json_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentsession',
+            name='agent_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='agentrequestlog',
+            name='agent_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(backfill_agent_name, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 import uuid
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from apps.agent_registry.models import Agent
 
 User = get_user_model()
@@ -10,17 +12,30 @@ class AgentSession(models.Model):
     """Tracks active agent sessions and their JWTs"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     agent = models.ForeignKey(Agent, on_delete=models.CASCADE, related_name='sessions')
+    # Denormalized from Agent so list endpoints don't need a JOIN per row;
+    # kept in sync on rename by signals.sync_agent_name.
+    agent_name = models.CharField(max_length=255, blank=True)
     jti = models.CharField(max_length=255, unique=True)  # JWT ID
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
-    last_activity = models.DateTimeField(auto_now=True)
+    # Managed explicitly by the auth layer (writes are coalesced); auto_now
+    # would touch the column on every save() regardless of update_fields.
+    last_activity = models.DateTimeField(default=timezone.now)
     expires_at = models.DateTimeField()
     revoked_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         indexes = [
-            models.Index(fields=['jti']),
+            # Partial covering index for the auth hot path: lookup by jti on
+            # non-revoked sessions, with the columns authenticate() reads
+            # included so Postgres can answer from the index alone.
+            models.Index(
+                fields=['jti'],
+                condition=Q(revoked_at__isnull=True),
+                name='idx_agentsession_active_jti',
+                include=['agent', 'expires_at', 'last_activity'],
+            ),
             models.Index(fields=['agent', 'expires_at']),
         ]
 
@@ -29,11 +44,15 @@ class AgentRequestLog(models.Model):
     """Logs every request made by agents"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     agent = models.ForeignKey(Agent, on_delete=models.CASCADE, related_name='requests')
+    agent_name = models.CharField(max_length=255, blank=True)
     session = models.ForeignKey(AgentSession, on_delete=models.SET_NULL, null=True)
     method = models.CharField(max_length=10)
     path = models.CharField(max_length=500)
-    query_params = models.JSONField(default=dict)
-    headers = models.JSONField(default=dict)
+    # These fields are write-only payload capture — never queried by content,
+    # so they carry no GIN index, and empty values are stored as NULL rather
+    # than paying JSONB encoding for a default '{}' on every insert.
+    query_params = models.JSONField(null=True, blank=True)
+    headers = models.JSONField(null=True, blank=True)
     body = models.JSONField(null=True, blank=True)
     response_status = models.IntegerField()
     response_body = models.JSONField(null=True, blank=True)
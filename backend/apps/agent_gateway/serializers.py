@@ -9,19 +9,18 @@ class AgentLoginSerializer(serializers.Serializer):
 
 
 class AgentSessionSerializer(serializers.ModelSerializer):
-    agent_name = serializers.CharField(source='agent.name', read_only=True)
-    
+    # agent_name is denormalized onto the row — no JOIN needed to serialize.
+
     class Meta:
         model = AgentSession
-        fields = ['id', 'agent', 'agent_name', 'jti', 'ip_address', 
+        fields = ['id', 'agent', 'agent_name', 'jti', 'ip_address',
                   'last_activity', 'expires_at', 'revoked_at', 'created_at']
-        read_only_fields = ['id', 'jti', 'created_at']
+        read_only_fields = ['id', 'agent_name', 'jti', 'created_at']
 
 
 class AgentRequestLogSerializer(serializers.ModelSerializer):
-    agent_name = serializers.CharField(source='agent.name', read_only=True)
-    
     class Meta:
         model = AgentRequestLog
-        fields = '__all__'
-        read_only_fields = ['id', 'created_at']
\ No newline at end of file
+        fields = ['id', 'agent', 'agent_name', 'session', 'method', 'path',
+                  'response_status', 'duration_ms', 'created_at']
+        read_only_fields = ['id', 'agent_name', 'created_at']
\ No newline at end of file
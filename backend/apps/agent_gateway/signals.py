@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.agent_registry.models import Agent
+from .models import AgentSession, AgentRequestLog
+
+
+@receiver(post_save, sender=Agent)
+def sync_agent_name(sender, instance, created, **kwargs):
+    """
+    Keep the denormalized agent_name columns in sync on rename.
+
+    Renames are rare and sessions/logs are written constantly, so paying
+    two bulk UPDATEs here beats a JOIN on every list query.
+    """
+    if created:
+        return
+    AgentSession.objects.filter(agent=instance).exclude(
+        agent_name=instance.name
+    ).update(agent_name=instance.name)
+    AgentRequestLog.objects.filter(agent=instance).exclude(
+        agent_name=instance.name
+    ).update(agent_name=instance.name)
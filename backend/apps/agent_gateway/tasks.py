@@ -0,0 +1,49 @@
+from celery import shared_task
+import logging
+
+import orjson
+
+from .middleware import QUEUE_KEY, drain_queue, get_redis_client
+from .models import AgentRequestLog
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_request_logs(batch_size=500):
+    """
+    Drain buffered request log entries from Redis into the database.
+
+    Scheduled via Celery beat (see CELERY_BEAT_SCHEDULE). One bulk_create
+    amortizes the INSERT round-trip and index maintenance over the whole
+    batch instead of paying it once per request. Entries are popped
+    atomically from the tail (drain_queue) — the middleware LPUSHes onto
+    the head, so a concurrent push can't be trimmed away unread or
+    re-read as a duplicate.
+    """
+    client = get_redis_client()
+    raw_entries = drain_queue(client, QUEUE_KEY, batch_size)
+    if not raw_entries:
+        return 0
+
+    rows = []
+    for raw in raw_entries:
+        try:
+            entry = orjson.loads(raw)
+            rows.append(AgentRequestLog(
+                agent_id=entry["agent_id"],
+                agent_name=entry.get("agent_name", ""),
+                method=entry["method"],
+                path=entry["path"],
+                query_params=entry.get("query_params") or None,
+                headers=entry.get("headers") or None,
+                body=entry.get("body"),
+                response_status=entry["response_status"],
+                duration_ms=entry["duration_ms"],
+            ))
+        except Exception:
+            logger.exception("Dropping malformed request log entry")
+
+    if rows:
+        AgentRequestLog.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
@@ -1,3 +1,142 @@
+import uuid
+from datetime import timedelta
+
+import jwt
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import exceptions, status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from apps.agent_registry.models import Agent
+from apps.agent_registry.utils import generate_agent_token
+from . import token_cache
+from .authentication import AgentAuthentication, _fast_decode, _SIGNING_KEY
+
+User = get_user_model()
+
+
+def _make_token(**overrides):
+    """Mint a token the way AgentLoginView does; None drops a claim."""
+    payload = {
+        'agent_id': str(uuid.uuid4()),
+        'jti': str(uuid.uuid4()),
+        'ver': 0,
+        'exp': timezone.now() + timedelta(hours=1),
+        'iat': timezone.now(),
+        'token_type': 'access',
+        'type': 'agent',
+    }
+    payload.update(overrides)
+    payload = {k: v for k, v in payload.items() if v is not None}
+    return jwt.encode(payload, _SIGNING_KEY, algorithm='HS256'), payload
+
+
+class FastDecodeTests(TestCase):
+    """_fast_decode must behave exactly like the jwt.decode() it replaced."""
+
+    def test_valid_token_round_trip(self):
+        token, payload = _make_token()
+        decoded = _fast_decode(token)
+        self.assertEqual(decoded['agent_id'], payload['agent_id'])
+        self.assertEqual(decoded['jti'], payload['jti'])
+        self.assertEqual(decoded['ver'], payload['ver'])
+
+    def test_parity_with_pyjwt_decode(self):
+        token, _ = _make_token()
+        self.assertEqual(
+            _fast_decode(token),
+            jwt.decode(token, _SIGNING_KEY, algorithms=['HS256']),
+        )
+
+    def test_wrong_key_signature_rejected(self):
+        token, _ = _make_token()
+        header_b64, payload_b64, _sig = token.split('.')
+        forged_sig = jwt.encode({'x': 1}, b'other-secret', algorithm='HS256').split('.')[2]
+        forged = '.'.join([header_b64, payload_b64, forged_sig])
+        with self.assertRaises(jwt.InvalidSignatureError):
+            _fast_decode(forged)
+
+    def test_tampered_payload_rejected(self):
+        # Splice a validly signed signature onto a different payload — the
+        # classic token-swap tamper.
+        token_a, _ = _make_token()
+        token_b, _ = _make_token()
+        header_b64, _payload_a, sig_a = token_a.split('.')
+        _header, payload_b, _sig_b = token_b.split('.')
+        with self.assertRaises(jwt.InvalidSignatureError):
+            _fast_decode('.'.join([header_b64, payload_b, sig_a]))
+
+    def test_missing_required_claims_rejected(self):
+        for claim in ('jti', 'agent_id', 'exp'):
+            token, _ = _make_token(**{claim: None})
+            with self.assertRaises(jwt.MissingRequiredClaimError):
+                _fast_decode(token)
+
+    def test_expired_token_rejected(self):
+        token, _ = _make_token(exp=timezone.now() - timedelta(seconds=5))
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            _fast_decode(token)
+
+    def test_garbage_token_rejected(self):
+        for bad in ('not-a-token', 'a.b', 'a.b.c', ''):
+            with self.assertRaises(jwt.InvalidTokenError):
+                _fast_decode(bad)
+
+
+class TokenVersionRevocationTests(APITestCase):
+    """Bumping an agent's token_version must revoke its outstanding JWTs."""
+
+    def setUp(self):
+        cache.clear()  # token + version caches live in the default backend
+        self.user = User.objects.create_user(username="gatekeeper", password="pass")
+        self.agent = Agent.objects.create(
+            name="GatewayAgent",
+            owner=self.user,
+            identity_key=generate_agent_token(),
+        )
+        self.factory = APIRequestFactory()
+
+    def _login(self):
+        response = self.client.post(
+            reverse("agent-login"),
+            {
+                "agent_id": str(self.agent.id),
+                "identity_key": self.agent.identity_key,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["access_token"]
+
+    def _authenticate(self, token):
+        request = self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return AgentAuthentication().authenticate(request)
+
+    def test_login_bakes_current_version_into_token(self):
+        token = self._login()
+        self.assertEqual(_fast_decode(token)["ver"], self.agent.token_version)
+
+    def test_fresh_token_authenticates(self):
+        token = self._login()
+        agent, returned = self._authenticate(token)
+        self.assertEqual(agent.pk, self.agent.pk)
+        self.assertEqual(returned, token)
+
+    def test_version_bump_revokes_outstanding_token(self):
+        token = self._login()
+        self._authenticate(token)  # warm the caches, as real traffic would
+
+        # Wholesale revocation, the way AgentLogoutView does it: bump the
+        # counter and drop both cache entries so the change is immediate.
+        Agent.objects.filter(pk=self.agent.pk).update(
+            token_version=F("token_version") + 1
+        )
+        token_cache.invalidate(token)
+        token_cache.invalidate_agent_version(self.agent.pk)
 
-# Create your tests here.
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self._authenticate(token)
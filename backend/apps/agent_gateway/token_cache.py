@@ -0,0 +1,82 @@
+"""
+Cache-aside store for verified agent JWTs.
+
+Verifying a token costs one HMAC pass plus an AgentSession SELECT (and,
+historically, a last_activity UPDATE) on every authenticated request.
+Since a token that verified a moment ago will verify identically until it
+expires or is revoked, we cache the verification result keyed by the
+SHA-256 of the raw token.
+
+The TTL is capped at MAX_TTL_SECONDS so a revoked session stops
+authenticating within that bound even if the explicit invalidate() call
+is missed (e.g. revocation done straight in the DB).
+"""
+import hashlib
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+KEY_PREFIX = "agent_jwt:"
+
+# Upper bound on how long a revoked token can keep authenticating from cache.
+MAX_TTL_SECONDS = 60
+
+
+def _key(token: str) -> str:
+    return KEY_PREFIX + hashlib.sha256(token.encode()).hexdigest()
+
+
+def get(token: str):
+    """Return the cached {'agent_id', 'session_id', 'expires_at'} dict, or None."""
+    return cache.get(_key(token))
+
+
+def store(token: str, agent_id, session_id, expires_at) -> None:
+    """Cache a verified token for min(time-to-expiry, MAX_TTL_SECONDS)."""
+    ttl = min(
+        (expires_at - timezone.now()).total_seconds(),
+        MAX_TTL_SECONDS,
+    )
+    if ttl <= 0:
+        return
+    cache.set(
+        _key(token),
+        {
+            "agent_id": str(agent_id),
+            "session_id": str(session_id),
+            "expires_at": expires_at,
+        },
+        timeout=ttl,
+    )
+
+
+def invalidate(token: str) -> None:
+    """Drop a cached token, e.g. on logout/session revocation."""
+    cache.delete(_key(token))
+
+
+# ---------------------------------------------------------------------------
+# Token-version cache
+# ---------------------------------------------------------------------------
+# Each Agent carries a token_version counter baked into its JWTs as the
+# 'ver' claim. Bumping the counter revokes every outstanding token for
+# the agent; caching the current value means the check is an int compare
+# instead of a per-request session SELECT.
+
+VERSION_KEY_PREFIX = "agent_ver:"
+VERSION_TTL_SECONDS = 60
+
+
+def get_agent_version(agent_id):
+    """Return the cached token_version for an agent, or None."""
+    return cache.get(VERSION_KEY_PREFIX + str(agent_id))
+
+
+def set_agent_version(agent_id, version: int) -> None:
+    cache.set(VERSION_KEY_PREFIX + str(agent_id), version, timeout=VERSION_TTL_SECONDS)
+
+
+def invalidate_agent_version(agent_id) -> None:
+    """Drop the cached counter so the next request re-reads the new value."""
+    cache.delete(VERSION_KEY_PREFIX + str(agent_id))
@@ -1,16 +1,17 @@
 import uuid
 from datetime import timedelta
+from django.db.models import F
 from django.utils import timezone
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.conf import settings
 import jwt
 from apps.agent_registry.models import Agent
 from .models import AgentSession, AgentRequestLog
 from .serializers import AgentLoginSerializer, AgentSessionSerializer
-from .authentication import AgentAuthentication
+from .authentication import AgentAuthentication, _JWT, _SIGNING_KEY
+from . import token_cache
 
 
 class AgentLoginView(APIView):
@@ -39,17 +40,19 @@ class AgentLoginView(APIView):
         payload = {
             'agent_id': str(agent.id),
             'jti': jti,
+            'ver': agent.token_version,
             'exp': expires_at,
             'iat': timezone.now(),
             'token_type': 'access',
             'type': 'agent',
         }
         
-        token = jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
+        token = _JWT.encode(payload, _SIGNING_KEY, algorithm='HS256')
         
         # Create session
         session = AgentSession.objects.create(
             agent=agent,
+            agent_name=agent.name,
             jti=jti,
             expires_at=expires_at,
             ip_address=request.META.get('REMOTE_ADDR'),
@@ -74,19 +77,38 @@ class AgentLogoutView(APIView):
         token = auth_header.split()[1]
         
         try:
-            payload = jwt.decode(
-                token, 
-                settings.SECRET_KEY, 
+            payload = _JWT.decode(
+                token,
+                _SIGNING_KEY,
                 algorithms=['HS256']
             )
-            
-            session = AgentSession.objects.get(jti=payload['jti'])
-            session.revoked_at = timezone.now()
-            session.save()
-            
-            return Response({'message': 'Successfully logged out'})
-        except (jwt.InvalidTokenError, AgentSession.DoesNotExist):
+        except jwt.InvalidTokenError:
             return Response(
-                {'error': 'Invalid token'}, 
+                {'error': 'Invalid token'},
                 status=status.HTTP_400_BAD_REQUEST
-            )
\ No newline at end of file
+            )
+
+        # Single UPDATE instead of SELECT + full-row save(); the revoked_at
+        # filter keeps an already-revoked session from being re-stamped.
+        revoked = AgentSession.objects.filter(
+            jti=payload['jti'],
+            revoked_at__isnull=True,
+        ).update(revoked_at=timezone.now())
+
+        if not revoked:
+            return Response(
+                {'error': 'Invalid token'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Bump the agent's token_version so every outstanding JWT carrying
+        # the old 'ver' claim fails the version check without a session
+        # lookup, then drop both cache entries so revocation is immediate.
+        agent_id = payload['agent_id']
+        Agent.objects.filter(pk=agent_id).update(
+            token_version=F('token_version') + 1
+        )
+        token_cache.invalidate(token)
+        token_cache.invalidate_agent_version(agent_id)
+
+        return Response({'message': 'Successfully logged out'})
\ No newline at end of file
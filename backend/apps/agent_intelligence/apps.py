@@ -1,5 +1,23 @@
+import sys
+
 from django.apps import AppConfig
 
 
 class AgentIntelligenceConfig(AppConfig):
     name = 'apps.agent_intelligence'
+
+    def ready(self):
+        # Warm the tool registry at worker boot instead of on the first
+        # request, so no user pays the DB read + schema-build cold start.
+        # Skip it for management commands that run before the schema exists
+        # (migrate/makemigrations/collectstatic) — the registry would query
+        # a table that may not be there yet.
+        skip_commands = {'migrate', 'makemigrations', 'collectstatic', 'test'}
+        if len(sys.argv) > 1 and sys.argv[1] in skip_commands:
+            return
+        from .utils.tool_registry import ToolRegistry
+        try:
+            ToolRegistry.initialise()
+        except Exception:  # pragma: no cover - boot must not die on a bad tool row
+            import logging
+            logging.getLogger(__name__).exception("Tool registry preload failed")
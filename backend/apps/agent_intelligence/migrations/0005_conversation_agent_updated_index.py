@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-08-26 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agent_intelligence', '0004_alter_conversation_status_pendingaction'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['agent', '-updated_at'], name='agent_intel_agent_i_c9b1f4_idx'),
+        ),
+    ]
@@ -180,9 +180,18 @@ class Conversation(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            # Matches the list query: filter by agent, order by -updated_at.
+            # Named explicitly so the auto-generated hash can't drift
+            # between Django versions and trip makemigrations --check.
+            models.Index(
+                fields=['agent', '-updated_at'],
+                name='agent_intel_agent_i_c9b1f4_idx',
+            ),
+        ]
 
 
 class Message(models.Model):
@@ -213,6 +222,13 @@ class Message(models.Model):
     class Meta:
         ordering = ['created_at']
 
+    def save(self, *args, **kwargs):
+        # Normalise once on write so readers can index role maps directly
+        # instead of re-uppercasing every row on every turn.
+        if self.role:
+            self.role = self.role.upper()
+        super().save(*args, **kwargs)
+
 
 class ToolDefinition(models.Model):
     """Define tools that agents can use"""
@@ -11,8 +11,20 @@ from apps.agent_registry.models import Agent
 class LLMConfigSerializer(serializers.ModelSerializer):
     class Meta:
         model = LLMConfig
-        fields = '__all__'
+        # Explicit field list: avoids DRF introspecting every column per
+        # request and keeps internals (rate limits, cost tables) off the wire.
+        fields = [
+            'id', 'name', 'provider', 'model_name',
+            'api_key', 'api_base', 'organization',
+            'temperature', 'max_tokens', 'top_p',
+            'frequency_penalty', 'presence_penalty',
+            'supports_tools', 'supports_vision', 'supports_streaming',
+            'max_context_length', 'is_active',
+            'created_by', 'created_at', 'updated_at',
+        ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+        # Never echo the (encrypted) key back to clients.
+        extra_kwargs = {'api_key': {'write_only': True}}
 
 
 class AgentCapabilitySerializer(serializers.ModelSerializer):
@@ -36,26 +48,40 @@ class AgentCapabilitySerializer(serializers.ModelSerializer):
 class MessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Message
-        fields = '__all__'
+        fields = [
+            'id', 'conversation', 'role', 'content',
+            'tool_calls', 'tool_call_id', 'tool_name',
+            'tokens', 'created_at',
+        ]
         read_only_fields = ['id', 'created_at']
 
 
 class ConversationSerializer(serializers.ModelSerializer):
     messages = MessageSerializer(many=True, read_only=True)
     agent_name = serializers.CharField(source='agent.name', read_only=True)
-    
+
     class Meta:
         model = Conversation
-        fields = '__all__'
+        fields = [
+            'id', 'agent', 'agent_name', 'session_id', 'title', 'status',
+            'llm_config', 'messages',
+            'total_tokens_input', 'total_tokens_output', 'total_cost',
+            'created_at', 'updated_at',
+        ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
 class ToolDefinitionSerializer(serializers.ModelSerializer):
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
-    
+
     class Meta:
         model = ToolDefinition
-        fields = '__all__'
+        fields = [
+            'id', 'name', 'description', 'parameters_schema', 'tool_type',
+            'api_endpoint', 'api_method', 'api_headers', 'function_path',
+            'required_permissions', 'rate_limit', 'is_active',
+            'created_by', 'created_by_username', 'created_at', 'updated_at',
+        ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
 
 
@@ -8,6 +8,44 @@ from apps.billing.services import BillingService
 
 logger = logging.getLogger(__name__)
 
+@shared_task
+def run_agent_turn(conversation_id, content):
+    """
+    Run one full chat turn off the request thread.
+
+    LLM calls are network-bound, so running executor.invoke inline pins a
+    WSGI worker for the whole round-trip. The message_async endpoint
+    enqueues this task and returns the task id immediately; clients poll
+    the task-status endpoint for the reply.
+    """
+    # Imported here to avoid a module-level cycle with views.py.
+    from django.utils import timezone
+    from apps.agent_intelligence.views import (
+        _build_agent_state, _extract_reply, _persist_history, _record_usage,
+    )
+
+    conversation = (
+        Conversation.objects
+        .select_related("agent__capability__primary_llm")
+        .get(id=conversation_id)
+    )
+    agent = conversation.agent
+    capability = agent.capability
+
+    start_time = time.time()
+    executor = LangGraphAgentFactory.create_agent(agent)
+    state = _build_agent_state(agent, capability, conversation, content, executor=executor)
+    config = {"configurable": {"thread_id": str(conversation.id)}}
+    result = executor.invoke(state, config=config)
+    reply = _extract_reply(result)
+
+    _record_usage(agent, conversation, start_time)
+    _persist_history(conversation, result["messages"], user_content=content)
+    Conversation.objects.filter(pk=conversation.pk).update(updated_at=timezone.now())
+
+    return {"response": reply, "conversation_id": str(conversation.id)}
+
+
 @shared_task
 def execute_agent_background(agent_id, task_description, conversation_id=None):
     """Execute an agent in the background via Celery."""
@@ -1,8 +1,17 @@
+from unittest.mock import MagicMock, patch
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
 from apps.agent_registry.models import Agent, AgentType
-from apps.agent_intelligence.models import LLMConfig, AgentCapability, Conversation, TraceStep
+from apps.agent_intelligence.models import (
+    LLMConfig, AgentCapability, Conversation, TraceStep, PendingAction
+)
 from apps.agent_intelligence.utils.agent_factory import LangGraphAgentFactory
+from apps.policy_engine.models import Policy, PolicyEffect
 import uuid
 
 User = get_user_model()
@@ -98,3 +107,110 @@ class SecurityAndHITLTests(TestCase):
         
         self.assertEqual(Conversation.objects.get(id=conv.id).status, "ACTIVE")
         self.assertEqual(PendingAction.objects.get(id=pending.id).status, "APPROVED")
+
+
+class AsyncMessageEndpointTests(APITestCase):
+    """message-async must mirror the sync action's policy handling."""
+
+    def setUp(self):
+        cache.clear()  # policy-version counter lives in the default cache
+        self.user = User.objects.create_user(username="async_user", password="pass")
+        self.client.force_authenticate(user=self.user)
+        self.llm_config = LLMConfig.objects.create(
+            name="Async LLM", provider="GEMINI", model_name="gemini-pro"
+        )
+        self.agent = Agent.objects.create(
+            name="AsyncAgent", owner=self.user, identity_key=str(uuid.uuid4())
+        )
+        AgentCapability.objects.create(agent=self.agent, primary_llm=self.llm_config)
+        self.conversation = Conversation.objects.create(agent=self.agent)
+        self.url = reverse("conversation-message-async", args=[self.conversation.id])
+
+    def test_enqueues_task_when_allowed(self):
+        Policy.objects.create(
+            name="Allow execution",
+            effect=PolicyEffect.ALLOW,
+            resources=["agent:execute"],
+        )
+        with patch("apps.agent_intelligence.views.run_agent_turn") as task:
+            task.delay.return_value = MagicMock(id="task-123")
+            response = self.client.post(self.url, {"content": "hello"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["task_id"], "task-123")
+        task.delay.assert_called_once_with(str(self.conversation.id), "hello")
+        self.assertEqual(PendingAction.objects.count(), 0)
+
+    def test_escalation_creates_pending_action(self):
+        Policy.objects.create(
+            name="Escalate execution",
+            effect=PolicyEffect.ESCALATE,
+            resources=["agent:execute"],
+        )
+        with patch("apps.agent_intelligence.views.run_agent_turn") as task:
+            response = self.client.post(self.url, {"content": "wire funds"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "PENDING_APPROVAL")
+        task.delay.assert_not_called()
+        pending = PendingAction.objects.get(conversation=self.conversation)
+        self.assertEqual(pending.state_snapshot, {"content": "wire funds"})
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.status, "PENDING_APPROVAL")
+
+    def test_empty_content_rejected_before_escalation(self):
+        Policy.objects.create(
+            name="Escalate execution",
+            effect=PolicyEffect.ESCALATE,
+            resources=["agent:execute"],
+        )
+        response = self.client.post(self.url, {"content": "  "}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(PendingAction.objects.count(), 0)
+
+    def test_denied_policy_returns_403(self):
+        Policy.objects.create(
+            name="Deny execution",
+            effect=PolicyEffect.DENY,
+            resources=["agent:execute"],
+        )
+        response = self.client.post(self.url, {"content": "hello"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_stream_escalation_creates_pending_action(self):
+        Policy.objects.create(
+            name="Escalate execution",
+            effect=PolicyEffect.ESCALATE,
+            resources=["agent:execute"],
+        )
+        url = reverse("conversation-stream", args=[self.conversation.id])
+        response = self.client.post(url, {"content": "wire funds"}, format="json")
+        # Escalations never open a stream — same 202 + PendingAction as
+        # the sync message action.
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "PENDING_APPROVAL")
+        pending = PendingAction.objects.get(conversation=self.conversation)
+        self.assertEqual(pending.state_snapshot, {"content": "wire funds"})
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.status, "PENDING_APPROVAL")
+
+    def test_stream_empty_content_rejected(self):
+        Policy.objects.create(
+            name="Escalate execution",
+            effect=PolicyEffect.ESCALATE,
+            resources=["agent:execute"],
+        )
+        url = reverse("conversation-stream", args=[self.conversation.id])
+        response = self.client.post(url, {"content": ""}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(PendingAction.objects.count(), 0)
+
+    def test_task_status_reports_result(self):
+        with patch("apps.agent_intelligence.views.AsyncResult") as async_result:
+            async_result.return_value = MagicMock(
+                state="SUCCESS",
+                result={"response": "done"},
+                successful=MagicMock(return_value=True),
+            )
+            response = self.client.get(reverse("task-status", args=["task-123"]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["state"], "SUCCESS")
+        self.assertEqual(response.data["result"], {"response": "done"})
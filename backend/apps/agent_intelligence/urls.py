@@ -4,7 +4,7 @@ from .views import (
     LLMConfigViewSet, AgentCapabilityViewSet,
     ToolDefinitionViewSet, ConversationViewSet,
     WorkflowTaskViewSet, AgentExecuteView,
-    PendingActionViewSet
+    PendingActionViewSet, TaskResultView
 )
 
 router = DefaultRouter()
@@ -18,4 +18,5 @@ router.register(r'pending-actions', PendingActionViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('execute/', AgentExecuteView.as_view(), name='agent-execute'),
+    path('task-status/<str:task_id>/', TaskResultView.as_view(), name='task-status'),
 ]
\ No newline at end of file
@@ -1,5 +1,6 @@
 import logging
-from typing import List
+from collections import OrderedDict
+from typing import Any, Dict, List
 
 from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -21,7 +22,11 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 class AgentState(TypedDict):
-    # add_messages merges incoming message lists instead of replacing them.
+    # Deliberately a TypedDict: StateGraph derives its state channels from
+    # the annotations, and add_messages both merges updates and coerces the
+    # role dicts the views feed in into BaseMessage objects. A frozen
+    # struct type (msgspec/pydantic) is not a supported state schema here
+    # and would lose that coercion.
     messages: Annotated[list, add_messages]
     next: str
     agent_id: str
@@ -34,6 +39,26 @@ class AgentState(TypedDict):
 # Factory
 # ---------------------------------------------------------------------------
 
+# Compiled graphs keyed by (agent id, capability.updated_at). Compilation
+# validates nodes/edges and builds the pregel plan on every call otherwise —
+# pure overhead before the first LLM token. Keying on updated_at means a
+# saved capability misses the cache naturally (same scheme as the LLM client
+# cache in llm_manager). Reusing the compiled app also reuses its
+# MemorySaver, so per-thread checkpoints now survive across requests.
+# Bounded LRU so a tenant with thousands of agents can't grow worker RSS
+# without limit — least-recently-used compiled graphs are dropped first.
+_AGENT_CACHE: "OrderedDict[tuple, Any]" = OrderedDict()
+_AGENT_CACHE_MAX = 256
+
+# Hoisted out of agent_node: the prompt never changes and SystemMessage is
+# immutable, so building it per LLM turn was wasted allocation.
+_REACT_SYSTEM_MSG = SystemMessage(content=(
+    "You are an autonomous agent with access to tools.\n"
+    "Reason step-by-step and use the provided tools when needed.\n"
+    "When the task is complete, provide a final answer to the user."
+))
+
+
 class LangGraphAgentFactory:
     """Factory for creating LangGraph-based agents."""
 
@@ -42,12 +67,23 @@ class LangGraphAgentFactory:
         """Main entry point to create an agent based on its capability type."""
         if not hasattr(agent, 'capability'):
             raise ValueError(f"Agent {agent.name} ({agent.id}) has no capability configuration.")
-        
+
         cap = agent.capability
-        if cap.graph_type == 'MULTI_AGENT':
-            return cls.create_supervisor_agent(agent, cap)
+        cache_key = (str(agent.id), cap.updated_at)
+        app = _AGENT_CACHE.get(cache_key)
+        if app is None:
+            for stale in [k for k in _AGENT_CACHE if k[0] == cache_key[0]]:
+                del _AGENT_CACHE[stale]
+            if cap.graph_type == 'MULTI_AGENT':
+                app = cls.create_supervisor_agent(agent, cap)
+            else:
+                app = cls.create_react_agent(agent, cap)
+            _AGENT_CACHE[cache_key] = app
+            while len(_AGENT_CACHE) > _AGENT_CACHE_MAX:
+                _AGENT_CACHE.popitem(last=False)
         else:
-            return cls.create_react_agent(agent, cap)
+            _AGENT_CACHE.move_to_end(cache_key)
+        return app
 
     @classmethod
     def create_supervisor_agent(cls, agent: Agent, capability: AgentCapability):
@@ -186,11 +222,9 @@ class LangGraphAgentFactory:
         # Bind tools to the model so it can emit structured tool-call messages.
         llm_with_tools = llm.bind_tools(tools)
 
-        system_prompt = (
-            "You are an autonomous agent with access to tools.\n"
-            "Reason step-by-step and use the provided tools when needed.\n"
-            "When the task is complete, provide a final answer to the user."
-        )
+        # Keep at most this many prior messages per LLM call (each memory
+        # "turn" is a user/assistant pair, hence the *2).
+        history_window = max(capability.memory_window, 1) * 2
 
         # ------------------------------------------------------------------ #
         # Node: agent                                                          #
@@ -223,7 +257,12 @@ class LangGraphAgentFactory:
                     "iterations": iterations,
                 }
 
-            messages = [SystemMessage(content=system_prompt)] + list(state["messages"])
+            # Tuple build instead of list concat — no O(n) copy of the shared
+            # history list — with the window applied DB-free via slicing.
+            history = state["messages"]
+            if len(history) > history_window:
+                history = history[-history_window:]
+            messages = (_REACT_SYSTEM_MSG, *history)
             response = llm_with_tools.invoke(messages)
             
             # Record Trace & Metrics
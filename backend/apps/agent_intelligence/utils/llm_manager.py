@@ -1,3 +1,4 @@
+import importlib
 import logging
 from typing import Optional, Dict, Any
 
@@ -5,79 +6,112 @@ from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Provider name → (module, class). The heavy LangChain imports happen at
+# most once per provider, on first use, and are memoized below — dispatch
+# after that is a single dict lookup instead of an if/elif chain.
+_PROVIDER_IMPORTS = {
+    "GEMINI": ("langchain_google_genai", "ChatGoogleGenerativeAI"),
+    "CLAUDE": ("langchain_anthropic", "ChatAnthropic"),
+    "OPENAI": ("langchain_openai", "ChatOpenAI"),
+    "MISTRAL": ("langchain_mistralai", "ChatMistralAI"),
+    "LLAMA": ("langchain_community.chat_models", "ChatOllama"),
+}
+_PROVIDER_CLASSES: Dict[str, Any] = {}
+
+
+def _load_provider(provider: str):
+    """Import and memoize the chat-model class for a provider."""
+    cls_ = _PROVIDER_CLASSES.get(provider)
+    if cls_ is None:
+        try:
+            module_path, class_name = _PROVIDER_IMPORTS[provider]
+        except KeyError:
+            raise ValueError(f"Unsupported provider: {provider!r}")
+        cls_ = getattr(importlib.import_module(module_path), class_name)
+        _PROVIDER_CLASSES[provider] = cls_
+    return cls_
+
+# Cache of constructed chat-model clients keyed by (config pk, updated_at).
+# Constructing a LangChain client builds HTTP pools and loads credentials —
+# far too expensive to repeat per agent turn. Keying on updated_at makes a
+# saved LLMConfig miss the cache naturally, so no signal wiring is needed;
+# stale entries for the same config are evicted on the next miss.
+_LLM_CACHE: Dict[tuple, Any] = {}
+
 
 class LLMManager:
     """Factory for creating LangChain LLM instances from our config."""
 
     @classmethod
     def get_llm(cls, config):
-        """Return a LangChain chat model instance from an LLMConfig object."""
+        """Return a (cached) LangChain chat model instance for an LLMConfig."""
+        cache_key = (str(config.pk), config.updated_at)
+        llm = _LLM_CACHE.get(cache_key)
+        if llm is None:
+            for stale in [k for k in _LLM_CACHE if k[0] == cache_key[0]]:
+                del _LLM_CACHE[stale]
+            llm = cls._build_llm(config)
+            _LLM_CACHE[cache_key] = llm
+        return llm
 
+    @classmethod
+    def _build_llm(cls, config):
+        """Construct a fresh chat model instance from an LLMConfig object."""
         provider = config.provider
+        model_cls = _load_provider(provider)  # raises for unknown providers
+        return model_cls(**cls._build_kwargs(provider, config))
+
+    @staticmethod
+    def _build_kwargs(provider: str, config) -> Dict[str, Any]:
+        """Map an LLMConfig onto the constructor kwargs for a provider."""
         api_key = config.decrypted_api_key
 
         if provider == "GEMINI":
-            from langchain_google_genai import ChatGoogleGenerativeAI
-
-            return ChatGoogleGenerativeAI(
-                model=config.model_name,
-                google_api_key=api_key or getattr(settings, "GEMINI_API_KEY", None),
-                temperature=config.temperature,
-                max_output_tokens=config.max_tokens,
-                top_p=config.top_p,
+            return {
+                "model": config.model_name,
+                "google_api_key": api_key or getattr(settings, "GEMINI_API_KEY", None),
+                "temperature": config.temperature,
+                "max_output_tokens": config.max_tokens,
+                "top_p": config.top_p,
                 # Gemini no longer needs convert_system_message_to_human for
                 # gemini-1.5+ models, but keep it for older model compatibility.
-                convert_system_message_to_human=True,
-            )
-
-        elif provider == "CLAUDE":
-            from langchain_anthropic import ChatAnthropic
-
-            return ChatAnthropic(
-                model=config.model_name,
+                "convert_system_message_to_human": True,
+            }
+        if provider == "CLAUDE":
+            return {
+                "model": config.model_name,
                 # Both spellings are accepted; 'max_tokens' is the canonical one.
-                max_tokens=config.max_tokens,
-                anthropic_api_key=api_key or getattr(settings, "ANTHROPIC_API_KEY", None),
-                temperature=config.temperature,
-                top_p=config.top_p,
-            )
-
-        elif provider == "OPENAI":
-            from langchain_openai import ChatOpenAI
-
-            return ChatOpenAI(
-                model=config.model_name,
-                openai_api_key=api_key or getattr(settings, "OPENAI_API_KEY", None),
-                temperature=config.temperature,
-                max_tokens=config.max_tokens,
-                top_p=config.top_p,
-                frequency_penalty=config.frequency_penalty,
-                presence_penalty=config.presence_penalty,
-            )
-
-        elif provider == "MISTRAL":
-            from langchain_mistralai import ChatMistralAI
-
-            return ChatMistralAI(
-                model=config.model_name,
-                mistral_api_key=api_key or getattr(settings, "MISTRAL_API_KEY", None),
-                temperature=config.temperature,
-                max_tokens=config.max_tokens,
-                top_p=config.top_p,
-            )
-
-        elif provider == "LLAMA":
-            from langchain_community.chat_models import ChatOllama
-
-            return ChatOllama(
-                model=config.model_name or "llama2",
-                temperature=config.temperature,
-                top_p=config.top_p,
-                num_predict=config.max_tokens,
-            )
-
-        else:
-            raise ValueError(f"Unsupported provider: {provider!r}")
+                "max_tokens": config.max_tokens,
+                "anthropic_api_key": api_key or getattr(settings, "ANTHROPIC_API_KEY", None),
+                "temperature": config.temperature,
+                "top_p": config.top_p,
+            }
+        if provider == "OPENAI":
+            return {
+                "model": config.model_name,
+                "openai_api_key": api_key or getattr(settings, "OPENAI_API_KEY", None),
+                "temperature": config.temperature,
+                "max_tokens": config.max_tokens,
+                "top_p": config.top_p,
+                "frequency_penalty": config.frequency_penalty,
+                "presence_penalty": config.presence_penalty,
+            }
+        if provider == "MISTRAL":
+            return {
+                "model": config.model_name,
+                "mistral_api_key": api_key or getattr(settings, "MISTRAL_API_KEY", None),
+                "temperature": config.temperature,
+                "max_tokens": config.max_tokens,
+                "top_p": config.top_p,
+            }
+        if provider == "LLAMA":
+            return {
+                "model": config.model_name or "llama2",
+                "temperature": config.temperature,
+                "top_p": config.top_p,
+                "num_predict": config.max_tokens,
+            }
+        raise ValueError(f"Unsupported provider: {provider!r}")
 
     @classmethod
     def get_recommended_config(cls, purpose: str) -> Dict[str, Any]:
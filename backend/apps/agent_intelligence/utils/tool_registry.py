@@ -1,13 +1,37 @@
 import importlib
+import json
 import logging
+import sys
+import threading
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from langchain.tools import BaseTool
 from langchain_core.tools import tool, StructuredTool
 
 logger = logging.getLogger(__name__)
 
+# create_model builds a full pydantic-core SchemaValidator/SchemaSerializer
+# per model — the single biggest allocator when loading many tools.
+# Identical schema fragments produce identical models, so memoize on the
+# canonical JSON of the schema and reuse one model class across reloads.
+_SCHEMA_CACHE: Dict[tuple, Any] = {}
+
+
+@lru_cache(maxsize=None)
+def _cached_import(module_path: str, func_name: str):
+    """
+    Resolve a dotted function path once and memoize it. import_module takes
+    the import lock even for modules already in sys.modules, which stalls
+    concurrent registry initialisation; checking sys.modules first avoids it.
+    """
+    module = sys.modules.get(module_path) or importlib.import_module(module_path)
+    return getattr(module, func_name)
+
 
 # ---------------------------------------------------------------------------
 # Registry
@@ -36,11 +60,33 @@ class ToolRegistry:
     """
 
     _registry: Optional["ToolRegistry"] = None  # module-level singleton
+    _registry_lock = threading.Lock()
     _tools: Dict[str, BaseTool]
 
     def __init__(self):
         # _tools is populated lazily by initialise() or the first get_tool() call.
         self._tools = {}
+        # Resolved tool lists per capability, keyed on
+        # (capability pk, tuple(tools_enabled)) — rebuilding the same list
+        # (with per-miss logging) on every agent invocation added up.
+        self._agent_tool_cache: Dict[tuple, List[BaseTool]] = {}
+        # One pooled session shared by every API tool: agent loops hit the
+        # same endpoints repeatedly, and module-level requests.get/post paid
+        # a fresh TCP+TLS handshake per call.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Async counterpart used when the graph runs via ainvoke/astream —
+        # lets a multi-tool step fan its HTTP calls out concurrently.
+        self._aclient = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=64),
+        )
 
     # ------------------------------------------------------------------ #
     # Singleton helpers                                                    #
@@ -53,9 +99,13 @@ class ToolRegistry:
         Call this once from AppConfig.ready() so the ORM is available.
         """
         if cls._registry is None:
-            instance = cls()
-            instance._load_tools()
-            cls._registry = instance
+            # Double-checked lock: under gthread workers two requests can
+            # race the lazy get_registry() fallback and load tools twice.
+            with cls._registry_lock:
+                if cls._registry is None:
+                    instance = cls()
+                    instance._load_tools()
+                    cls._registry = instance
         return cls._registry
 
     @classmethod
@@ -75,7 +125,17 @@ class ToolRegistry:
         """Load all active ToolDefinition rows and register them."""
         from ..models import ToolDefinition  # deferred — ORM must be ready
 
-        db_tools = ToolDefinition.objects.filter(is_active=True)
+        # only() + iterator(): stream rows through a server-side cursor with
+        # just the columns tool construction needs, instead of buffering the
+        # whole table (parameters_schema JSON included) in memory at boot.
+        db_tools = (
+            ToolDefinition.objects.filter(is_active=True)
+            .only(
+                "name", "tool_type", "description", "parameters_schema",
+                "api_endpoint", "api_method", "api_headers", "function_path",
+            )
+            .iterator(chunk_size=200)
+        )
         for db_tool in db_tools:
             try:
                 if db_tool.tool_type == "API":
@@ -94,19 +154,29 @@ class ToolRegistry:
         method: str = (db_tool.api_method or "GET").upper()
         endpoint: str = db_tool.api_endpoint
         description: str = db_tool.description
+        session = self._session
+
+        aclient = self._aclient
 
         def _call(**kwargs):
             if method == "GET":
-                resp = requests.get(endpoint, params=kwargs, headers=headers, timeout=30)
-            elif method == "POST":
-                resp = requests.post(endpoint, json=kwargs, headers=headers, timeout=30)
+                resp = session.get(endpoint, params=kwargs, headers=headers, timeout=30)
             else:
-                resp = requests.request(method, endpoint, json=kwargs, headers=headers, timeout=30)
+                resp = session.request(method, endpoint, json=kwargs, headers=headers, timeout=30)
+            resp.raise_for_status()
+            return resp.text
+
+        async def _acall(**kwargs):
+            if method == "GET":
+                resp = await aclient.get(endpoint, params=kwargs, headers=headers)
+            else:
+                resp = await aclient.request(method, endpoint, json=kwargs, headers=headers)
             resp.raise_for_status()
             return resp.text
 
         return StructuredTool.from_function(
             func=_call,
+            coroutine=_acall,
             name=db_tool.name,
             description=description,
             args_schema=schema,
@@ -115,8 +185,7 @@ class ToolRegistry:
     def _create_function_tool(self, db_tool) -> BaseTool:
         """Dynamically import a Python function and wrap it as a StructuredTool."""
         module_path, func_name = db_tool.function_path.rsplit(".", 1)
-        module = importlib.import_module(module_path)
-        func = getattr(module, func_name)
+        func = _cached_import(module_path, func_name)
 
         schema = self._build_pydantic_schema(db_tool.parameters_schema, db_tool.name)
 
@@ -133,10 +202,15 @@ class ToolRegistry:
 
     @staticmethod
     def _build_pydantic_schema(parameters_schema: Dict, tool_name: str):
-        """Derive a Pydantic v2 model from a JSON-Schema-style dict."""
-        from pydantic import BaseModel, create_model
+        """Derive (and memoize) a Pydantic v2 model from a JSON-Schema-style dict."""
+        from pydantic import BaseModel, ConfigDict, create_model
         from typing import Optional as Opt
 
+        cache_key = (tool_name, json.dumps(parameters_schema, sort_keys=True, default=str))
+        cached = _SCHEMA_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
         _type_map = {
             "integer": int,
             "number": float,
@@ -157,7 +231,18 @@ class ToolRegistry:
             else:
                 fields[param_name] = (Opt[python_type], None)
 
-        return create_model(f"{tool_name}Schema", **fields)
+        # defer_build postpones SchemaValidator construction until the model
+        # is first used. Tool arguments still come from an LLM and go through
+        # full validation at call time — only the eager build at registry
+        # initialise() is skipped, which keeps startup RSS down for agents
+        # with many registered tools.
+        model = create_model(
+            f"{tool_name}Schema",
+            __config__=ConfigDict(defer_build=True),
+            **fields,
+        )
+        _SCHEMA_CACHE[cache_key] = model
+        return model
 
     # ------------------------------------------------------------------ #
     # Public API                                                           #
@@ -175,7 +260,8 @@ class ToolRegistry:
         Returns an empty list (with a warning) if the attribute path is missing.
         """
         try:
-            allowed_names: List[str] = agent.capability.tools_enabled
+            capability = agent.capability
+            allowed_names: List[str] = capability.tools_enabled
         except AttributeError:
             logger.warning(
                 "Agent %r has no capability.tools_enabled — returning no tools",
@@ -183,6 +269,11 @@ class ToolRegistry:
             )
             return []
 
+        cache_key = (capability.pk, tuple(allowed_names))
+        cached = self._agent_tool_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         tools = []
         for name in allowed_names:
             t = self.get_tool(name)
@@ -190,8 +281,18 @@ class ToolRegistry:
                 tools.append(t)
             else:
                 logger.warning("Tool %r is listed for agent %r but not registered", name, agent)
+        self._agent_tool_cache[cache_key] = tools
         return tools
 
+    @classmethod
+    def invalidate_agent(cls, capability_id) -> None:
+        """Drop cached tool lists for a capability (call after tools_enabled changes)."""
+        registry = cls._registry
+        if registry is None:
+            return
+        for key in [k for k in registry._agent_tool_cache if k[0] == capability_id]:
+            del registry._agent_tool_cache[key]
+
     def list_available_tools(self) -> List[Dict[str, Any]]:
         """Return a summary list of all registered tools."""
         return [
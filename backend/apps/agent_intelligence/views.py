@@ -1,9 +1,13 @@
 import logging
 
+import orjson
+from celery.result import AsyncResult
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, permissions, status
 from rest_framework.generics import views
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
 from django.utils import timezone
 
 from .models import (
@@ -16,6 +20,7 @@ from .serializers import (
     ToolDefinitionSerializer, AgentExecuteSerializer,
     WorkflowTaskSerializer, TraceStepSerializer, PendingActionSerializer
 )
+from .tasks import run_agent_turn
 from .utils.llm_manager import LLMManager
 from .utils.tool_registry import ToolRegistry
 from .utils.agent_factory import LangGraphAgentFactory
@@ -50,7 +55,9 @@ def _record_usage(agent, conversation, start_time):
 
 def _check_policy(agent, action: str, context: dict = None):
     """Run the policy evaluator; return (decision, reason, policy)."""
-    evaluator = PolicyEvaluator(agent)
+    # for_agent reuses the compiled evaluator across turns until the
+    # policy set changes.
+    evaluator = PolicyEvaluator.for_agent(agent)
     decision, policy, reason = evaluator.evaluate(
         resource="agent:execute",
         action=action,
@@ -59,6 +66,29 @@ def _check_policy(agent, action: str, context: dict = None):
     return decision, reason, policy
 
 
+def _validate_turn(agent, action: str, context: dict = None):
+    """
+    Run the per-turn guards once: policy evaluation plus the capability
+    check, shared by the message and execute endpoints.
+
+    Returns (decision, reason, error_response); error_response is a ready
+    Response for DENY / missing capability and None when execution may
+    proceed (ALLOW, AUDIT or ESCALATE).
+    """
+    decision, reason, _policy = _check_policy(agent, action, context)
+    if decision == "DENY":
+        return decision, reason, Response(
+            {"error": f"Policy denied: {reason}"},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    if not hasattr(agent, "capability"):
+        return decision, reason, Response(
+            {"error": "Agent has no capability configuration"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return decision, reason, None
+
+
 def _extract_reply(result: dict) -> str:
     """Pull the final assistant text out of a LangGraph result dict."""
     last = result["messages"][-1]
@@ -77,49 +107,95 @@ _ROLE_MAP = {
     "TOOL":   "tool",
 }
 
-def _persist_history(conversation, result_messages):
-    """Save all new assistant/tool messages from the graph execution to the DB."""
-    # Get the count of existing messages to avoid duplicates
-    existing_count = conversation.messages.count()
-    
-    # New messages start after the existing ones
-    # Note: result_messages contains the FULL history (including user msg)
-    new_messages = result_messages[existing_count:]
-    
+def _is_user_message(msg) -> bool:
+    """True for the human/user turns in a LangGraph message list."""
+    if hasattr(msg, "type"):
+        return msg.type == "human"
+    if isinstance(msg, dict):
+        return msg.get("role") == "user"
+    return False
+
+
+def _persist_history(conversation, result_messages, user_content=None):
+    """
+    Save the turn's new messages to the DB with a single bulk INSERT.
+
+    Pass ``user_content`` when the user turn has not been persisted yet so
+    it lands in the same bulk_create as the assistant/tool messages instead
+    of costing its own round-trip before execution.
+    """
+    # Everything up to and including the LAST user message is prior history
+    # (checkpoint-restored or window-seeded); only what the graph appended
+    # after this turn's input is new. The DB message count can't be used as
+    # the cutoff: with windowed seeding the state may hold fewer messages
+    # than the table, which would make a count-based slice come up empty
+    # and silently drop the reply.
+    last_user_idx = -1
+    for idx, msg in enumerate(result_messages):
+        if _is_user_message(msg):
+            last_user_idx = idx
+    new_messages = result_messages[last_user_idx + 1:]
+
+    rows = []
+    if user_content:
+        rows.append(Message(conversation=conversation, role="USER", content=user_content))
+
     for msg in new_messages:
         role = "AGENT"
         if hasattr(msg, 'type'):
             if msg.type == 'human': role = "USER"
             elif msg.type == 'system': role = "SYSTEM"
             elif msg.type == 'tool': role = "TOOL"
-        
+
         content = msg.content if hasattr(msg, 'content') else str(msg)
         if not content: continue # skip empty
-        
-        # Only save if it's not the user's initial message (which we saved manually)
-        # or if we want to be safe, just skip USER roles in persist
+
+        # Skip USER roles here — the user turn is either already in the DB
+        # or included above via user_content.
         if role != "USER":
-            Message.objects.create(
-                conversation=conversation,
-                role=role,
-                content=content
-            )
+            rows.append(Message(conversation=conversation, role=role, content=content))
 
+    if rows:
+        Message.objects.bulk_create(rows)
 
-def _build_agent_state(agent, capability, conversation, content: str) -> dict:
+
+def _build_agent_state(agent, capability, conversation, content: str, executor=None) -> dict:
     """
     Construct the initial LangGraph state dict for one agent turn.
 
     Prior conversation turns are included so the graph's MemorySaver has
-    something to seed from on the first invocation of a thread.
+    something to seed from on the first invocation of a thread. When the
+    executor already holds a checkpoint for this thread (the compiled graph
+    is cached across requests), the prefetch is skipped entirely — the
+    checkpoint restores the history, so re-reading it would be redundant
+    work that grows with conversation length.
     """
-    prior = [
-        {
-            "role": _ROLE_MAP.get(msg.role.upper(), "user"),
-            "content": msg.content,
-        }
-        for msg in conversation.messages.order_by("created_at")
-    ]
+    prior = []
+    seed_needed = True
+    if executor is not None:
+        config = {"configurable": {"thread_id": str(conversation.id)}}
+        seed_needed = executor.checkpointer.get(config) is None
+    if seed_needed:
+        # Only the last memory window is seeded (the graph truncates to the
+        # same window anyway), sliced DB-side so long threads stay O(window).
+        window = max(getattr(capability, "memory_window", 10), 1) * 2
+        # values_list keeps this to one narrow query with no Message
+        # instantiation — on long threads the per-row model hydration showed up.
+        rows = list(
+            conversation.messages
+            .order_by("-created_at")
+            .values_list("role", "content")[:window]
+        )
+        rows.reverse()
+        prior = [
+            {
+                # Roles are normalised to upper case on write (Message.save),
+                # so index the map directly — bad data should fail loud here.
+                "role": _ROLE_MAP[role],
+                "content": row_content,
+            }
+            for role, row_content in rows
+        ]
     return {
         "messages": prior + [{"role": "user", "content": content}],
         "agent_id": str(agent.id),
@@ -170,10 +246,21 @@ class AgentCapabilityViewSet(viewsets.ModelViewSet):
                 {"error": "tool_name is required"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        if tool_name not in capability.tools_enabled:
-            capability.tools_enabled.append(tool_name)
-            capability.save()
-        return Response({"tools_enabled": capability.tools_enabled})
+        # Lock the row for the read-modify-write so two concurrent
+        # enable_tool calls can't clobber each other's append, and only
+        # touch the columns that changed instead of a full-row save().
+        with transaction.atomic():
+            locked = (
+                AgentCapability.objects.select_for_update()
+                .only("tools_enabled")
+                .get(pk=capability.pk)
+            )
+            if tool_name not in locked.tools_enabled:
+                locked.tools_enabled.append(tool_name)
+                # updated_at included so caches keyed on it roll over.
+                locked.save(update_fields=["tools_enabled", "updated_at"])
+                ToolRegistry.invalidate_agent(capability.pk)
+        return Response({"tools_enabled": locked.tools_enabled})
 
 
 class ToolDefinitionViewSet(viewsets.ModelViewSet):
@@ -198,7 +285,16 @@ class ConversationViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return self.queryset.filter(agent__owner=self.request.user)
+        # The serializer nests every message, so without the prefetch a list
+        # of N conversations costs N+1 message queries. select_related pulls
+        # the agent, its capability and LLM config in the same query — the
+        # message action reads all three on every turn.
+        return (
+            self.queryset
+            .filter(agent__owner=self.request.user)
+            .select_related("agent__capability__primary_llm", "agent__owner", "llm_config")
+            .prefetch_related("messages")
+        )
 
     @action(detail=True, methods=["post"])
     def message(self, request, pk=None):
@@ -206,15 +302,12 @@ class ConversationViewSet(viewsets.ModelViewSet):
         conversation = self.get_object()
         agent = conversation.agent
 
-        decision, reason, policy = _check_policy(
+        decision, reason, error = _validate_turn(
             agent, "chat", {"conversation_id": str(conversation.id)}
         )
-        if decision == "DENY":
-            return Response(
-                {"error": f"Policy denied: {reason}"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-        
+        if error is not None:
+            return error
+
         content = request.data.get("content", "").strip()
 
         if decision == "ESCALATE":
@@ -239,22 +332,14 @@ class ConversationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if not hasattr(agent, "capability"):
-            return Response(
-                {"error": "Agent has no capability configuration"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
         capability = agent.capability
 
-        # Persist user turn before running the agent so it's included in
-        # the state we pass to _build_agent_state.
-        Message.objects.create(conversation=conversation, role="USER", content=content)
-
+        # The user turn is passed to the graph via _build_agent_state and
+        # persisted together with the reply in one bulk INSERT below.
         start_time = time.time()
         try:
             executor = LangGraphAgentFactory.create_agent(agent)
-            state = _build_agent_state(agent, capability, conversation, content)
+            state = _build_agent_state(agent, capability, conversation, content, executor=executor)
             # MemorySaver requires thread_id in the configurable dict so it
             # knows which checkpoint stream to read/write.  Using conversation.id
             # means each conversation has its own isolated memory thread and
@@ -265,9 +350,9 @@ class ConversationViewSet(viewsets.ModelViewSet):
             
             # Record usage
             _record_usage(agent, conversation, start_time)
-            
-            # Persist all intermediate messages
-            _persist_history(conversation, result["messages"])
+
+            # Persist user turn + all intermediate messages in one INSERT
+            _persist_history(conversation, result["messages"], user_content=content)
         except Exception:
             logger.exception("Agent execution failed for conversation %s", conversation.id)
             return Response(
@@ -275,14 +360,154 @@ class ConversationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        conversation.updated_at = timezone.now()
-        conversation.save()
+        # Single UPDATE instead of a full-row save().
+        Conversation.objects.filter(pk=conversation.pk).update(updated_at=timezone.now())
 
         return Response({
             "response": reply,
             "conversation_id": str(conversation.id),
         })
 
+    @action(detail=True, methods=["post"], url_path="message-async")
+    def message_async(self, request, pk=None):
+        """
+        Enqueue one message turn on Celery and return the task id.
+
+        The synchronous `message` action holds a WSGI worker for the whole
+        LLM round-trip; this variant frees the worker immediately and the
+        client polls the task-status endpoint for the reply.
+        """
+        conversation = self.get_object()
+        agent = conversation.agent
+
+        decision, reason, error = _validate_turn(
+            agent, "chat", {"conversation_id": str(conversation.id)}
+        )
+        if error is not None:
+            return error
+
+        # Content is validated before the escalation branch — an empty
+        # body must 400, not enter the approval queue with nothing to
+        # approve.
+        content = request.data.get("content", "").strip()
+        if not content:
+            return Response(
+                {"error": "Message content required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if decision == "ESCALATE":
+            # Same escalation flow as the sync `message` action: the
+            # PendingAction row is what the approval queue picks up, and
+            # the snapshot carries the content so approval can replay it.
+            PendingAction.objects.create(
+                conversation=conversation,
+                agent=agent,
+                action_type="chat",
+                resource="agent:execute",
+                reason=reason,
+                state_snapshot={"content": content}
+            )
+            conversation.status = "PENDING_APPROVAL"
+            conversation.save()
+            return Response(
+                {"status": "PENDING_APPROVAL", "reason": reason},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        task = run_agent_turn.delay(str(conversation.id), content)
+        return Response(
+            {"task_id": task.id, "conversation_id": str(conversation.id)},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=True, methods=["post"])
+    def stream(self, request, pk=None):
+        """
+        Send one message turn and stream intermediate graph states as SSE.
+
+        Unlike `message`, the worker doesn't block until the final reply:
+        each node transition is flushed to the client as it happens, so
+        time-to-first-byte stays flat on long tool-using runs. Persistence
+        happens once, after the stream completes, via the same bulk path.
+        """
+        conversation = self.get_object()
+        agent = conversation.agent
+
+        decision, reason, error = _validate_turn(
+            agent, "chat", {"conversation_id": str(conversation.id)}
+        )
+        if error is not None:
+            return error
+
+        content = request.data.get("content", "").strip()
+        if not content:
+            return Response(
+                {"error": "Message content required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if decision == "ESCALATE":
+            # Escalations need the approval flow — no point holding a
+            # stream open; behave like `message`, including the
+            # PendingAction row the approval queue consumes.
+            PendingAction.objects.create(
+                conversation=conversation,
+                agent=agent,
+                action_type="chat",
+                resource="agent:execute",
+                reason=reason,
+                state_snapshot={"content": content}
+            )
+            conversation.status = "PENDING_APPROVAL"
+            conversation.save()
+            return Response(
+                {"status": "PENDING_APPROVAL", "reason": reason},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        capability = agent.capability
+        executor = LangGraphAgentFactory.create_agent(agent)
+        state = _build_agent_state(agent, capability, conversation, content, executor=executor)
+        config = {"configurable": {"thread_id": str(conversation.id)}}
+        start_time = time.time()
+
+        def event_stream():
+            final_messages = None
+            try:
+                for event in executor.stream(state, config=config, stream_mode="values"):
+                    messages = event.get("messages")
+                    if not messages:
+                        continue
+                    final_messages = messages
+                    last = messages[-1]
+                    chunk = {
+                        "type": getattr(last, "type", "message"),
+                        "content": getattr(last, "content", str(last)),
+                    }
+                    yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+            except Exception:
+                logger.exception(
+                    "Streaming execution failed for conversation %s", conversation.id
+                )
+                yield b'data: {"error": "Agent execution failed"}\n\n'
+                return
+
+            if final_messages is not None:
+                _record_usage(agent, conversation, start_time)
+                _persist_history(conversation, final_messages, user_content=content)
+                Conversation.objects.filter(pk=conversation.pk).update(
+                    updated_at=timezone.now()
+                )
+            yield b"data: [DONE]\n\n"
+
+        response = StreamingHttpResponse(
+            event_stream(), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # disable nginx buffering
+        return response
+
     @action(detail=True, methods=['get'])
     def traces(self, request, pk=None):
         """Get the execution trace for this conversation."""
@@ -353,7 +578,7 @@ class PendingActionViewSet(viewsets.ModelViewSet):
             start_time = time.time()
             try:
                 executor = LangGraphAgentFactory.create_agent(agent)
-                state = _build_agent_state(agent, capability, conversation, content)
+                state = _build_agent_state(agent, capability, conversation, content, executor=executor)
                 config = {"configurable": {"thread_id": str(conversation.id)}}
                 result = executor.invoke(state, config=config)
                 reply = _extract_reply(result)
@@ -402,25 +627,18 @@ class AgentExecuteView(views.APIView):
         task = serializer.validated_data["task"]
 
         try:
-            agent = Agent.objects.get(id=agent_id, owner=request.user)
+            agent = Agent.objects.select_related("capability__primary_llm").get(
+                id=agent_id, owner=request.user
+            )
         except Agent.DoesNotExist:
             return Response(
                 {"error": "Agent not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        decision, reason, policy = _check_policy(agent, "task", {"task_preview": task[:100]})
-        if decision == "DENY":
-            return Response(
-                {"error": f"Policy denied: {reason}"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-
-        if not hasattr(agent, "capability"):
-            return Response(
-                {"error": "Agent has no capability configuration"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        decision, reason, error = _validate_turn(agent, "task", {"task_preview": task[:100]})
+        if error is not None:
+            return error
         capability = agent.capability
 
         conversation = Conversation.objects.create(
@@ -453,7 +671,7 @@ class AgentExecuteView(views.APIView):
         start_time = time.time()
         try:
             executor = LangGraphAgentFactory.create_agent(agent)
-            state = _build_agent_state(agent, capability, conversation, task)
+            state = _build_agent_state(agent, capability, conversation, task, executor=executor)
             config = {"configurable": {"thread_id": str(conversation.id)}}
             result = executor.invoke(state, config=config)
             reply = _extract_reply(result)
@@ -481,4 +699,18 @@ class AgentExecuteView(views.APIView):
             "agent_id": str(agent.id),
             "agent_name": agent.name,
         })
+
+
+class TaskResultView(views.APIView):
+    """Poll the state/result of a Celery task queued via message-async."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, task_id):
+        result = AsyncResult(task_id)
+        payload = {"task_id": task_id, "state": result.state}
+        if result.successful():
+            payload["result"] = result.result
+        elif result.failed():
+            payload["error"] = "Agent execution failed"
+        return Response(payload)
             
\ No newline at end of file
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class AgentRegistryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.agent_registry'  # Must match the full dotted path
-    verbose_name = 'Agent Registry'
\ No newline at end of file
+    verbose_name = 'Agent Registry'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
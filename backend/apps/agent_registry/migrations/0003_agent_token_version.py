@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-08-26 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agent_registry', '0002_agent_department'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agent',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped to invalidate every outstanding JWT for this agent'),
+        ),
+    ]
@@ -69,6 +69,10 @@ class Agent(models.Model):
         help_text=_("Unique API token / cryptographic identity for the agent")
     )
     roles = models.ManyToManyField(Role, blank=True, related_name="agents")
+    token_version = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Bumped to invalidate every outstanding JWT for this agent")
+    )
     status = models.CharField(
         max_length=20,
         choices=AgentStatus.choices,
@@ -41,8 +41,15 @@ class AgentSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "owner", "identity_key", "created_at", "updated_at"]
 
     def create(self, validated_data):
-        # Identity is generated automatically, not from request data
-        from .utils import generate_agent_identity
-        identity = generate_agent_identity()
-        validated_data["identity_key"] = identity["token"]
-        return super().create(validated_data)
\ No newline at end of file
+        # Identity is generated automatically, not from request data.
+        # Token generation is inlined (generate_agent_identity wraps the
+        # token in a dict that was discarded immediately), and the row is
+        # created directly so DRF's generic create machinery doesn't walk
+        # the relation info again.
+        from .utils import generate_agent_token
+        validated_data["identity_key"] = generate_agent_token()
+        roles = validated_data.pop("roles", None)
+        instance = Agent.objects.create(**validated_data)
+        if roles is not None:
+            instance.roles.set(roles)
+        return instance
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""
+Invalidation hooks for the in-process agent-lookup memo (see utils).
+
+Any write to an Agent row — including ownership changes and deletes —
+drops its cached entries, so the memo never serves a stale agent in the
+process that made the change. Cross-process staleness is bounded by the
+memo's TTL.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Agent
+from .utils import invalidate_agent
+
+
+@receiver(post_save, sender=Agent)
+@receiver(post_delete, sender=Agent)
+def agent_changed(sender, instance, **kwargs):
+    invalidate_agent(instance.pk)
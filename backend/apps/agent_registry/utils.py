@@ -1,14 +1,70 @@
 import secrets
-import string
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Tuple
+
+from django.utils import timezone
+
+# Owner-scoped agent lookups, memoized in-process for a short window.
+# Under a traffic burst the same agent is fetched once per check request;
+# with the memo the DB sees one query per unique (agent, owner) pair per
+# TTL instead. LRU-bounded like the agent executor cache, and post_save/
+# post_delete on Agent invalidate eagerly (see signals.py) — the TTL only
+# bounds staleness across other processes.
+_AGENT_CACHE: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+_AGENT_CACHE_MAX = 10_000
+AGENT_CACHE_TTL_SECONDS = 10
+
+
+def get_agent(agent_id, owner_id):
+    """
+    Return the Agent with *agent_id* owned by *owner_id*, or None.
+
+    Only id and owner_id are fetched — enough for policy checks, which is
+    what this path serves. Not-found results are never cached, so a
+    freshly created agent is visible immediately.
+    """
+    from .models import Agent
+
+    key = (str(agent_id), str(owner_id))
+    now = timezone.now()
+    cached = _AGENT_CACHE.get(key)
+    if cached is not None and now < cached[0]:
+        _AGENT_CACHE.move_to_end(key)
+        return cached[1]
+    agent = (
+        Agent.objects.only('id', 'owner_id')
+        .filter(id=agent_id, owner_id=owner_id)
+        .first()
+    )
+    if agent is not None:
+        _AGENT_CACHE[key] = (
+            now + timedelta(seconds=AGENT_CACHE_TTL_SECONDS),
+            agent,
+        )
+        _AGENT_CACHE.move_to_end(key)
+        if len(_AGENT_CACHE) > _AGENT_CACHE_MAX:
+            _AGENT_CACHE.popitem(last=False)
+    return agent
+
+
+def invalidate_agent(agent_id) -> None:
+    """Drop every cached entry for *agent_id* (post_save/delete hook)."""
+    aid = str(agent_id)
+    for key in [k for k in _AGENT_CACHE if k[0] == aid]:
+        _AGENT_CACHE.pop(key, None)
 
 
 def generate_agent_token(length=43):
     """
     Generate a secure, URL-safe token for agent authentication.
     Default length 43 gives ~256 bits of entropy.
+
+    One CSPRNG read + one base64url encode, instead of the old
+    per-character secrets.choice loop. `length` is kept for API
+    compatibility and translated to the equivalent number of bytes.
     """
-    alphabet = string.ascii_letters + string.digits
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    return secrets.token_urlsafe(max(1, length * 6 // 8))[:length]
 
 
 def generate_agent_identity():
@@ -1,6 +1,7 @@
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend  # requires django-filter
 from .models import Agent, Role, AgentStatus
 from .serializers import AgentSerializer, RoleSerializer
@@ -29,6 +30,20 @@ class AgentViewSet(viewsets.ModelViewSet):
     search_fields = ["name", "version"]
     ordering_fields = ["created_at", "updated_at", "name"]
 
+    def get_queryset(self):
+        # The serializer nests every role, so listing N agents without the
+        # prefetch costs N+1 role queries; only() keeps the prefetched rows
+        # to the columns RoleSerializer actually renders.
+        return self.queryset.prefetch_related(
+            Prefetch(
+                "roles",
+                queryset=Role.objects.only(
+                    "id", "name", "description", "permissions",
+                    "created_at", "updated_at",
+                ),
+            )
+        )
+
     def perform_create(self, serializer):
         # Automatically set the owner to the current user
         serializer.save(owner=self.request.user)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class PolicyEngineConfig(AppConfig):
     name = 'apps.policy_engine'
+
+    def ready(self):
+        from . import signals  # noqa: F401 — connect cache-invalidation receivers
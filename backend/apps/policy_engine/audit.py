@@ -0,0 +1,48 @@
+"""
+Buffered audit-log writes for policy evaluations.
+
+_log_decision used to be a synchronous PolicyAuditLog INSERT inside every
+evaluate() call. Entries are instead serialized with orjson and LPUSHed
+onto a Redis list, and a Celery beat task drains the list with one
+bulk_create (see tasks.flush_audit_logs) — the same buffering scheme as
+the agent_gateway request log. Audit rows are compliance data, so if
+Redis is unavailable the entry is written synchronously rather than
+dropped.
+
+A Redis stream (XADD/XREADGROUP with a capped maxlen) was considered in
+place of the list. It buys nothing here: the beat task is the single
+consumer, so consumer groups add bookkeeping without extra parallelism,
+and a maxlen cap silently discards audit entries under backlog — the one
+failure mode this buffer must not have. The list is drained to empty on
+every flush, so its length is bounded by one second of evaluations plus
+however long the worker is down.
+"""
+import logging
+
+import orjson
+
+from apps.agent_gateway.middleware import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "policy_audit_log"
+
+
+def enqueue_audit_log(payload: dict) -> None:
+    """Buffer one audit entry; fall back to a synchronous INSERT on failure."""
+    try:
+        get_redis_client().lpush(QUEUE_KEY, orjson.dumps(payload))
+    except Exception:
+        logger.warning("Audit buffer unavailable — writing audit log synchronously")
+        from .models import PolicyAuditLog
+
+        PolicyAuditLog.objects.create(
+            agent_id=payload["agent_id"],
+            policy_id=payload.get("policy_id"),
+            resource=payload["resource"],
+            action=payload["action"],
+            decision=payload["decision"],
+            reason=payload["reason"],
+            request_data=payload.get("request_data") or {},
+            execution_time_ms=payload.get("execution_time_ms", 0),
+        )
@@ -2,7 +2,8 @@
 Management command: default_policies
 
 Creates the minimal set of Policy rows needed for a fresh install to
-function.  Safe to run multiple times (uses get_or_create).
+function.  Safe to run multiple times (one batched, conflict-ignoring
+INSERT keyed on the unique name).
 
 Usage:
     python manage.py default_policies
@@ -71,19 +72,28 @@ class Command(BaseCommand):
             )
             return
 
-        created_count = 0
+        # One SELECT for the existing names and one batched INSERT with
+        # ignore_conflicts, instead of a get_or_create round-trip pair per
+        # policy. name is unique, so concurrent runs stay idempotent.
+        names = [p["name"] for p in DEFAULT_POLICIES]
+        existing = set(
+            Policy.objects.filter(name__in=names).values_list("name", flat=True)
+        )
+        to_create = [
+            Policy(**policy_data)
+            for policy_data in DEFAULT_POLICIES
+            if policy_data["name"] not in existing
+        ]
+        Policy.objects.bulk_create(to_create, ignore_conflicts=True)
+
+        created_count = len(to_create)
         for policy_data in DEFAULT_POLICIES:
-            _policy, created = Policy.objects.get_or_create(
-                name=policy_data["name"],
-                defaults=policy_data,
-            )
-            if created:
-                created_count += 1
+            if policy_data["name"] in existing:
+                self.stdout.write(f"  ⏭  Already exists: {policy_data['name']}")
+            else:
                 self.stdout.write(
                     self.style.SUCCESS(f"  ✅ Created: {policy_data['name']}")
                 )
-            else:
-                self.stdout.write(f"  ⏭  Already exists: {policy_data['name']}")
 
         self.stdout.write(
             self.style.SUCCESS(
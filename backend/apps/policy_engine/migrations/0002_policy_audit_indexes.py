@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-08-26 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('policy_engine', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='policy',
+            name='policy_engi_valid_f_8924bc_idx',
+        ),
+        migrations.AddIndex(
+            model_name='policy',
+            index=models.Index(fields=['is_active', '-priority'], name='policy_engi_is_acti_3f7d21_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='policy',
+            index=models.Index(fields=['valid_from'], name='policy_engi_valid_f_b07c44_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='policy',
+            index=models.Index(fields=['valid_until'], name='policy_engi_valid_u_91d2ae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='policyauditlog',
+            index=models.Index(fields=['policy', 'created_at'], name='policy_engi_policy__6c41b9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='policyauditlog',
+            index=models.Index(fields=['resource', 'created_at'], name='policy_engi_resourc_d48e02_idx'),
+        ),
+    ]
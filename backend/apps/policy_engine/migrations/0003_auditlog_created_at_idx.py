@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-08-26 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('policy_engine', '0002_policy_audit_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='policyauditlog',
+            index=models.Index(fields=['-created_at'], name='policy_engi_created_2b8f47_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-08-26 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('policy_engine', '0003_auditlog_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='policyauditlog',
+            index=models.Index(fields=['agent', 'decision', 'created_at'], name='policy_engi_agent_i_7e5a93_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='policyauditlog',
+            index=models.Index(condition=models.Q(('decision', 'DENY')), fields=['agent', 'created_at'], name='audit_deny_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-08-26 15:30
+
+from django.db import migrations
+
+
+def create_trgm_index(apps, schema_editor):
+    # Trigram GIN is PostgreSQL-only; the dev default is SQLite, which
+    # skips the index (its tables are small enough for the seq scan).
+    # gin_trgm_ops accelerates the ILIKE '%term%' queries SearchFilter
+    # already issues — no queryset changes needed.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS policy_trgm_idx "
+        "ON policy_engine_policy USING gin "
+        "(name gin_trgm_ops, description gin_trgm_ops)"
+    )
+
+
+def drop_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS policy_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('policy_engine', '0004_auditlog_decision_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trgm_index, drop_trgm_index),
+    ]
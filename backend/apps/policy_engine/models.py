@@ -1,11 +1,16 @@
 import uuid
 from django.db import models
+from django.utils.functional import cached_property
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from apps.agent_gateway.middleware import get_redis_client
 from apps.agent_registry.models import Agent, Role
 
 User = get_user_model()
 
+# How long the shared quota counters live before reseeding from calls_made.
+QUOTA_TTL_SECONDS = 60
+
 
 class PolicyEffect(models.TextChoices):
     ALLOW = "ALLOW", _("Allow")
@@ -124,16 +129,121 @@ class Policy(models.Model):
         ordering = ["-priority", "name"]
         indexes = [
             models.Index(fields=["is_active", "effect"]),
-            models.Index(fields=["valid_from", "valid_until"]),
+            # The evaluator's filter(is_active=True).order_by("-priority")
+            # scans this index directly. Names are pinned to the migration's
+            # so the auto-generated hash can't drift across Django versions.
+            models.Index(
+                fields=["is_active", "-priority"],
+                name="policy_engi_is_acti_3f7d21_idx",
+            ),
+            # Single-column indexes: the validity predicates are independent
+            # range filters, so a composite (valid_from, valid_until) index
+            # only ever served its leading column.
+            models.Index(fields=["valid_from"], name="policy_engi_valid_f_b07c44_idx"),
+            models.Index(fields=["valid_until"], name="policy_engi_valid_u_91d2ae_idx"),
         ]
     
     def __str__(self):
         return f"{self.name} ({self.effect})"
     
+    @cached_property
+    def is_constant(self) -> bool:
+        """
+        True when evaluation cannot depend on context — i.e. the policy has
+        no conditions, so it always resolves to its effect for a matching
+        resource. Uses .all() so a conditions prefetch answers from cache.
+        """
+        return not self.conditions.all()
+
+    def _quota_cache_key(self):
+        return f"policy:{self.pk}:quota"
+
+    def _seed_quota(self, client):
+        """Seed the shared counter from the DB column when it is missing.
+
+        SET NX means a concurrent seeder can't reset a counter that other
+        workers already decremented, and the finite TTL periodically
+        re-derives the value from calls_made so a drifted counter can't
+        stay wrong forever.
+        """
+        key = self._quota_cache_key()
+        if client.exists(key):
+            return
+        calls_made = (
+            type(self).objects.values_list("calls_made", flat=True).get(pk=self.pk)
+        )
+        client.set(
+            key,
+            max(self.max_calls - calls_made, 0),
+            nx=True,
+            ex=QUOTA_TTL_SECONDS,
+        )
+
+    def has_quota(self) -> bool:
+        """
+        Read-only check of the remaining max_calls quota.
+
+        The counter lives in the shared Redis, so every worker process sees
+        the same value. This only pre-filters exhausted policies; the
+        authoritative charge is consume_quota(). Policies without a
+        max_calls limit (NULL or 0) always pass, and a Redis outage falls
+        back to the DB columns rather than failing the evaluation.
+        """
+        if not self.max_calls:
+            return True
+        try:
+            client = get_redis_client()
+            self._seed_quota(client)
+            remaining = client.get(self._quota_cache_key())
+        except Exception:
+            return self.calls_made < self.max_calls
+        if remaining is None:
+            return self.calls_made < self.max_calls
+        return int(remaining) > 0
+
+    def consume_quota(self) -> bool:
+        """
+        Atomically charge one application against max_calls.
+
+        DECR first, then refuse (and undo) when the result goes negative:
+        unlike a check-then-decrement, concurrent evaluations across
+        workers cannot all pass the check and overshoot the cap. Returns
+        True when the call was counted; on False the caller must not apply
+        the policy. Falls back to a DB compare when Redis is unavailable.
+        """
+        if not self.max_calls:
+            self.increment_calls()
+            return True
+        try:
+            client = get_redis_client()
+            self._seed_quota(client)
+            key = self._quota_cache_key()
+            remaining = client.decr(key)
+            # DECR on a key that expired mid-flight recreates it without a
+            # TTL; make sure one is always set so the counter reseeds.
+            client.expire(key, QUOTA_TTL_SECONDS, nx=True)
+            if remaining < 0:
+                client.incr(key)
+                return False
+        except Exception:
+            if self.calls_made >= self.max_calls:
+                return False
+        self.increment_calls()
+        return True
+
     def increment_calls(self):
-        """Increment the call counter for this policy"""
+        """Record one application of this policy.
+
+        Done with a single atomic UPDATE instead of read-modify-write +
+        save(): concurrent evaluations no longer lose increments, and the
+        request path skips the post_save signal machinery. The in-memory
+        counter is advanced too so max_calls checks on a cached instance
+        track the DB between refreshes.
+        """
+        type(self).objects.filter(pk=self.pk).update(
+            calls_made=models.F("calls_made") + 1
+        )
         self.calls_made += 1
-        self.save(update_fields=["calls_made"])
     
     def is_valid_now(self):
         """Check if policy is currently valid based on time constraints"""
@@ -144,7 +254,7 @@ class Policy(models.Model):
             return False
         if self.valid_until and now > self.valid_until:
             return False
-        if self.max_calls and self.calls_made >= self.max_calls:
+        if not self.has_quota():
             return False
             
         return True
@@ -206,4 +316,33 @@ class PolicyAuditLog(models.Model):
         indexes = [
             models.Index(fields=["agent", "created_at"]),
             models.Index(fields=["decision", "created_at"]),
+            # Audit views also slice by policy or resource over a time range.
+            # Names pinned to the migrations' so the hash can't drift.
+            models.Index(
+                fields=["policy", "created_at"],
+                name="policy_engi_policy__6c41b9_idx",
+            ),
+            models.Index(
+                fields=["resource", "created_at"],
+                name="policy_engi_resourc_d48e02_idx",
+            ),
+            # The unfiltered (staff) listing pages newest-first; this lets
+            # it come straight off an index scan instead of sorting the
+            # whole table. The owner-scoped listing is already served by
+            # (agent, created_at) scanned backwards.
+            models.Index(fields=["-created_at"], name="policy_engi_created_2b8f47_idx"),
+            # Filtering one agent's log by decision is the common audit
+            # drill-down; the composite serves filter and sort together.
+            models.Index(
+                fields=["agent", "decision", "created_at"],
+                name="policy_engi_agent_i_7e5a93_idx",
+            ),
+            # DENY rows are the ones investigators page through on
+            # deny-heavy tables — a partial index keeps that scan to just
+            # the denied fraction.
+            models.Index(
+                fields=["agent", "created_at"],
+                condition=models.Q(decision="DENY"),
+                name="audit_deny_idx",
+            ),
         ]
\ No newline at end of file
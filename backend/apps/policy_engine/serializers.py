@@ -50,6 +50,30 @@ class PolicySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'calls_made', 'created_by', 'created_at', 'updated_at']
 
 
+class PolicyListSerializer(PolicySerializer):
+    """
+    List rendition of PolicySerializer: related agents, roles and
+    conditions as pk lists instead of fully nested serializers. With the
+    viewset's prefetch the pks come straight from the prefetch cache, so
+    listing P policies stays at a fixed query count with no per-row
+    nested serialization.
+    """
+    conditions = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    roles = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    agents = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+
+class PolicyLightSerializer(serializers.ModelSerializer):
+    """
+    Minimal rendition for create-and-return paths (e.g. duplicate):
+    just enough for the client to reference the new policy, with no
+    related-object traversal at all.
+    """
+    class Meta:
+        model = Policy
+        fields = ['id', 'name', 'created_at']
+
+
 class PolicyAssignmentSerializer(serializers.ModelSerializer):
     policy_name = serializers.CharField(source='policy.name', read_only=True)
     agent_name = serializers.CharField(source='agent.name', read_only=True)
@@ -62,14 +86,26 @@ class PolicyAssignmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'assigned_by', 'assigned_at']
 
 
-class PolicyAuditLogSerializer(serializers.ModelSerializer):
-    agent_name = serializers.CharField(source='agent.name', read_only=True)
-    policy_name = serializers.CharField(source='policy.name', read_only=True)
-    
-    class Meta:
-        model = PolicyAuditLog
-        fields = '__all__'
-        read_only_fields = ['id', 'created_at']
+class PolicyAuditLogSerializer(serializers.Serializer):
+    """
+    Read-only rendition fed from the viewset's .values() queryset: rows
+    arrive as plain dicts (joined names included), so serialization skips
+    model instantiation and related-descriptor access entirely.
+    """
+    id = serializers.UUIDField(read_only=True)
+    agent = serializers.UUIDField(read_only=True)
+    agent_name = serializers.CharField(source='agent__name', read_only=True)
+    policy = serializers.UUIDField(read_only=True, allow_null=True)
+    policy_name = serializers.CharField(source='policy__name', read_only=True, allow_null=True)
+    resource = serializers.CharField(read_only=True)
+    action = serializers.CharField(read_only=True)
+    request_data = serializers.JSONField(read_only=True)
+    decision = serializers.CharField(read_only=True)
+    reason = serializers.CharField(read_only=True)
+    ip_address = serializers.IPAddressField(read_only=True, allow_null=True)
+    user_agent = serializers.CharField(read_only=True, allow_blank=True)
+    execution_time_ms = serializers.IntegerField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
 
 
 class PolicyEvaluateSerializer(serializers.Serializer):
@@ -0,0 +1,80 @@
+"""
+Version-counter invalidation for the evaluator's policy cache.
+
+Any write to the policy graph (policies, their conditions, or who they are
+assigned to) bumps a single version key; PolicyEvaluator keys its cached
+applicable-policy lists on that version, so a bump makes every cached list
+miss on the next evaluate without touching the lists themselves.
+"""
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Policy, PolicyAssignment, PolicyCondition
+from apps.agent_gateway.middleware import get_redis_client
+from apps.agent_registry.models import Agent
+
+VERSION_KEY = "policy_engine:version"
+
+
+def get_policy_version() -> int:
+    """Current version of the policy set (0 until the first write)."""
+    return cache.get(VERSION_KEY, 0)
+
+
+def bump_policy_version() -> None:
+    cache.add(VERSION_KEY, 0, timeout=None)
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Key evicted between add and incr — reseed.
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+@receiver(post_save, sender=Policy)
+def policy_saved(sender, instance, update_fields=None, **kwargs):
+    # increment_calls touches only the counter — not a semantic change,
+    # and bumping here would invalidate the cache on every allowed call.
+    if update_fields and set(update_fields) == {"calls_made"}:
+        return
+    # max_calls may have changed — drop the shared quota counter so the
+    # next check reseeds it from the fresh column values. Best-effort:
+    # the counter's TTL reseeds it anyway if Redis is unreachable here.
+    try:
+        get_redis_client().delete(instance._quota_cache_key())
+    except Exception:
+        pass
+    bump_policy_version()
+
+
+@receiver(post_delete, sender=Policy)
+@receiver(post_save, sender=PolicyCondition)
+@receiver(post_delete, sender=PolicyCondition)
+@receiver(post_save, sender=PolicyAssignment)
+@receiver(post_delete, sender=PolicyAssignment)
+def policy_graph_changed(sender, **kwargs):
+    bump_policy_version()
+
+
+@receiver(m2m_changed, sender=Policy.agents.through)
+@receiver(m2m_changed, sender=Policy.roles.through)
+@receiver(m2m_changed, sender=Policy.conditions.through)
+def policy_m2m_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_policy_version()
+
+
+@receiver(m2m_changed, sender=Agent.roles.through)
+def agent_roles_changed(sender, action, instance, reverse=False, pk_set=None, **kwargs):
+    # The evaluator caches each agent's role ids (utils._role_ids_for);
+    # drop them when the assignment changes so the next evaluate re-reads.
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    from .utils import invalidate_agent_roles
+
+    if reverse:
+        # role.agent_set changed — pk_set holds the affected agent ids.
+        for agent_pk in pk_set or ():
+            invalidate_agent_roles(agent_pk)
+    else:
+        invalidate_agent_roles(instance.pk)
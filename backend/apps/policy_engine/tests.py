@@ -1,3 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from apps.agent_registry.models import Agent
+from apps.agent_registry.utils import generate_agent_token
+from .models import Policy, PolicyCondition, PolicyEffect
+from .utils import PolicyEvaluator
+
+User = get_user_model()
+
+
+class ConditionCompilerTests(TestCase):
+    """The compiled closures must decide exactly like the old per-call code."""
+
+    def check(self, operator, value, candidate):
+        condition = PolicyCondition(field="x", operator=operator, value=value)
+        return PolicyEvaluator._compile_condition(condition)(candidate)
+
+    def test_eq_and_neq(self):
+        self.assertTrue(self.check("eq", "GET", "GET"))
+        self.assertFalse(self.check("eq", "GET", "POST"))
+        self.assertTrue(self.check("neq", "GET", "POST"))
+        self.assertFalse(self.check("neq", "GET", "GET"))
+
+    def test_gt_and_lt_cast_numeric_strings(self):
+        self.assertTrue(self.check("gt", 10, 11))
+        self.assertTrue(self.check("gt", "10", "11"))
+        self.assertFalse(self.check("gt", 10, 10))
+        self.assertTrue(self.check("lt", 10, 9))
+        self.assertFalse(self.check("lt", "10", "11"))
+
+    def test_gt_with_unpreparable_bound_is_false(self):
+        self.assertFalse(self.check("gt", {"not": "a number"}, 5))
+
+    def test_contains_on_strings_and_lists(self):
+        self.assertTrue(self.check("contains", "adm", "admin"))
+        self.assertTrue(self.check("contains", "crm", ["crm", "email"]))
+        self.assertFalse(self.check("contains", "crm", 42))
+        self.assertTrue(self.check("not_contains", "crm", ["email"]))
+        self.assertFalse(self.check("not_contains", "crm", ["crm"]))
+
+    def test_in_and_not_in(self):
+        self.assertTrue(self.check("in", ["GET", "HEAD"], "GET"))
+        self.assertFalse(self.check("in", ["GET", "HEAD"], "POST"))
+        self.assertTrue(self.check("not_in", ["GET"], "POST"))
+        # A non-list right-hand side can never match membership.
+        self.assertFalse(self.check("in", "GET", "GET"))
+
+    def test_between(self):
+        self.assertTrue(self.check("between", [1, 10], 5))
+        self.assertFalse(self.check("between", [1, 10], 11))
+        self.assertFalse(self.check("between", [1], 5))
+
+    def test_regex(self):
+        self.assertTrue(self.check("regex", r"^tool:", "tool:crm"))
+        self.assertFalse(self.check("regex", r"^tool:", "agent:execute"))
+        # An invalid pattern compiles to an always-False check, not a crash.
+        self.assertFalse(self.check("regex", "(", "anything"))
+
+    def test_unknown_operator_is_false(self):
+        self.assertFalse(self.check("xor", 1, 1))
+
+
+class PolicyEvaluationTests(TestCase):
+    """End-to-end: compiled conditions drive evaluate() decisions."""
+
+    def setUp(self):
+        cache.clear()  # policy-version counter lives in the default cache
+        self.user = User.objects.create_user(username="policy_user", password="pass")
+        self.agent = Agent.objects.create(
+            name="PolicyAgent",
+            owner=self.user,
+            identity_key=generate_agent_token(),
+        )
+        self.policy = Policy.objects.create(
+            name="Allow GETs on CRM",
+            effect=PolicyEffect.ALLOW,
+            resources=["tool:crm"],
+        )
+        condition = PolicyCondition.objects.create(
+            field="request.method", operator="eq", value="GET"
+        )
+        self.policy.conditions.add(condition)
+
+    def test_matching_condition_allows(self):
+        evaluator = PolicyEvaluator(self.agent)
+        decision, policy, _reason = evaluator.evaluate(
+            "tool:crm", "read", {"request": {"method": "GET"}}
+        )
+        self.assertEqual(decision, PolicyEffect.ALLOW)
+        self.assertEqual(policy.pk, self.policy.pk)
+
+    def test_failing_condition_falls_through_to_default_deny(self):
+        evaluator = PolicyEvaluator(self.agent)
+        decision, policy, reason = evaluator.evaluate(
+            "tool:crm", "read", {"request": {"method": "POST"}}
+        )
+        self.assertEqual(decision, PolicyEffect.DENY)
+        self.assertIsNone(policy)
+        self.assertEqual(reason, "No applicable policy found")
+
+    def test_missing_context_field_fails_the_condition(self):
+        evaluator = PolicyEvaluator(self.agent)
+        decision, policy, _reason = evaluator.evaluate("tool:crm", "read", {})
+        self.assertEqual(decision, PolicyEffect.DENY)
+        self.assertIsNone(policy)
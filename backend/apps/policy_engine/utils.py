@@ -1,11 +1,56 @@
+import fnmatch
 import re
-from typing import Dict, Any, List, Tuple, Optional
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from django.utils import timezone
 
-from .models import Policy, PolicyAuditLog, PolicyEffect
+from .models import Policy, PolicyEffect
 from apps.agent_registry.models import Agent
 
+# Applicable-policy lists per agent, keyed on the policy-set version counter
+# (see signals.py). Building a PolicyEvaluator runs the targeted/global union
+# query plus validity checks on every chat turn (twice for the message
+# endpoint); any policy/condition/assignment write bumps the version, so a
+# steady-state evaluate costs one cache.get and zero policy queries.
+_POLICY_LIST_CACHE: Dict[str, tuple] = {}
+
+# Fully constructed evaluators (resource index + compiled conditions),
+# keyed per agent on the same version counter. See PolicyEvaluator.for_agent.
+_EVALUATOR_CACHE: Dict[str, tuple] = {}
+
+# Compiled condition closures keyed on (pk, field, operator, value repr) —
+# content-addressed, so stale entries for edited conditions are simply never
+# hit again and need no explicit invalidation.
+_CONDITION_CACHE: Dict[tuple, tuple] = {}
+
+# Agent role ids, cached per agent. Roles effectively never change during a
+# request, but the values_list subquery executed with every policy-list
+# rebuild; m2m_changed on Agent.roles (signals.py) invalidates precisely,
+# with a TTL backstop for changes made in other processes.
+_AGENT_ROLE_CACHE: Dict[str, tuple] = {}
+ROLE_CACHE_TTL_SECONDS = 60
+
+
+def _role_ids_for(agent: Agent) -> tuple:
+    """Return the agent's role ids, cached in-process."""
+    now = timezone.now()
+    cached = _AGENT_ROLE_CACHE.get(str(agent.pk))
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    role_ids = tuple(agent.roles.values_list("id", flat=True))
+    _AGENT_ROLE_CACHE[str(agent.pk)] = (
+        now + timedelta(seconds=ROLE_CACHE_TTL_SECONDS),
+        role_ids,
+    )
+    return role_ids
+
+
+def invalidate_agent_roles(agent_id) -> None:
+    """Drop the cached role ids for one agent (m2m_changed hook)."""
+    _AGENT_ROLE_CACHE.pop(str(agent_id), None)
+
 
 class PolicyEvaluator:
     """
@@ -13,9 +58,155 @@ class PolicyEvaluator:
     Evaluates requests against all applicable policies.
     """
 
-    def __init__(self, agent: Agent):
+    # The version counter lives in the default cache backend; with LocMem
+    # that is per-process, so a bump in one worker is invisible to the
+    # others. The TTL bounds that cross-process staleness.
+    CACHE_TTL_SECONDS = 30
+
+    def __init__(self, agent: Agent, policies: Optional[List[Policy]] = None):
         self.agent = agent
-        self.applicable_policies = self._get_applicable_policies()
+        # An explicit policy list (the single-policy test endpoint) skips
+        # the applicable-policies lookup entirely — no point assembling the
+        # agent's full policy set just to throw it away.
+        if policies is not None:
+            self.restrict_to(policies)
+        else:
+            self.restrict_to(self._cached_applicable_policies())
+
+    @classmethod
+    def for_agent(cls, agent: Agent) -> "PolicyEvaluator":
+        """
+        Return a cached evaluator for *agent*, rebuilt only when the
+        policy-set version changes or the TTL lapses.
+
+        Construction compiles resource indexes and condition closures;
+        reusing the instance skips all of that per request. The compiled
+        state holds closures and compiled regexes, so it lives in-process
+        rather than pickled to a shared cache.
+        """
+        from .signals import get_policy_version
+
+        version = get_policy_version()
+        now = timezone.now()
+        cached = _EVALUATOR_CACHE.get(str(agent.pk))
+        if cached is not None:
+            cached_version, expires, evaluator = cached
+            if cached_version == version and now < expires:
+                return evaluator
+        evaluator = cls(agent)
+        _EVALUATOR_CACHE[str(agent.pk)] = (
+            version,
+            now + timedelta(seconds=cls.CACHE_TTL_SECONDS),
+            evaluator,
+        )
+        return evaluator
+
+    def restrict_to(self, policies: List[Policy]) -> None:
+        """
+        Point the evaluator at an explicit policy list and rebuild the
+        derived state (resource index, compiled conditions). Used at
+        construction and by the single-policy test endpoint — the indexes
+        hold positions into applicable_policies, so swapping the list
+        without rebuilding them would dereference the wrong policies.
+        """
+        self.applicable_policies = list(policies)
+        self._build_resource_index()
+        # Conditions compiled to direct closures — operator dispatch,
+        # right-hand casts and regex compilation happen at most once per
+        # condition per process, not per evaluate call. The process-level
+        # memo is keyed on the condition's own content, so an edited
+        # condition recompiles naturally while evaluator rebuilds (policy
+        # version bumps, TTL expiry) reuse existing closures.
+        compiled: Dict[Any, tuple] = {}
+        for policy in self.applicable_policies:
+            entries = []
+            for cond in policy.conditions.all():
+                key = (cond.pk, cond.field, cond.operator, repr(cond.value))
+                entry = _CONDITION_CACHE.get(key)
+                if entry is None:
+                    # The dotted field path is split here, once, so the walk
+                    # in _evaluate_conditions is a plain tuple loop per call.
+                    entry = (
+                        tuple(cond.field.split(".")),
+                        self._compile_condition(cond),
+                    )
+                    _CONDITION_CACHE[key] = entry
+                entries.append(entry)
+            compiled[policy.pk] = tuple(entries)
+        self._compiled_conditions = compiled
+
+    def _build_resource_index(self) -> None:
+        """
+        Invert the policies' resource patterns into an index keyed by how
+        they match: exact strings → policy positions, ':*' prefixes and
+        compiled globs as (pattern, position) lists.
+
+        evaluate() then only visits the policies whose patterns can match
+        the requested resource, instead of running every policy's patterns
+        per call. Positions are indices into applicable_policies, which is
+        already in -priority order, so a sorted position set preserves the
+        DENY-first-by-priority semantics.
+        """
+        self._exact: Dict[str, List[int]] = {}
+        self._prefixes: List[Tuple[str, int]] = []
+        self._globs: List[Tuple[Any, int]] = []
+        glob_patterns: List[str] = []
+        for idx, policy in enumerate(self.applicable_policies):
+            for pattern in policy.resources:
+                if pattern.endswith(":*") and not any(
+                    c in pattern[:-2] for c in ("*", "?", "[")
+                ):
+                    self._prefixes.append((pattern[:-2], idx))
+                elif any(c in pattern for c in ("*", "?", "[")):
+                    self._globs.append((re.compile(fnmatch.translate(pattern)), idx))
+                    glob_patterns.append(fnmatch.translate(pattern))
+                else:
+                    self._exact.setdefault(pattern, []).append(idx)
+        # All glob patterns fused into one alternation: a single C-level
+        # match answers "does ANY glob hit this resource". Only when it does
+        # (rare — most resources are exact or prefix matches) are the
+        # per-pattern regexes scanned to find which policies matched.
+        self._fused_glob = (
+            re.compile("|".join(glob_patterns)) if glob_patterns else None
+        )
+
+    def _candidate_policies(self, resource: str) -> List[Policy]:
+        """Policies whose patterns match *resource*, in priority order."""
+        hits = set(self._exact.get(resource, ()))
+        for prefix, idx in self._prefixes:
+            if resource.startswith(prefix):
+                hits.add(idx)
+        if self._fused_glob is not None and self._fused_glob.match(resource):
+            for regex, idx in self._globs:
+                if regex.match(resource):
+                    hits.add(idx)
+        return [self.applicable_policies[i] for i in sorted(hits)]
+
+    def _cached_applicable_policies(self) -> List[Policy]:
+        """
+        Return the agent's applicable policies, reusing the last computed
+        list while the policy-set version is unchanged and the TTL is fresh.
+
+        A rebuild filters validity in SQL; a cached list gets the cheap
+        Python is_valid_now() re-check instead, so a policy expiring (or
+        exhausting its quota) mid-TTL stops applying without a requery.
+        """
+        from .signals import get_policy_version
+
+        version = get_policy_version()
+        now = timezone.now()
+        cached = _POLICY_LIST_CACHE.get(str(self.agent.pk))
+        if cached is not None:
+            cached_version, expires, policies = cached
+            if cached_version == version and now < expires:
+                return [p for p in policies if p.is_valid_now()]
+        policies = self._get_applicable_policies()
+        _POLICY_LIST_CACHE[str(self.agent.pk)] = (
+            version,
+            now + timedelta(seconds=self.CACHE_TTL_SECONDS),
+            policies,
+        )
+        return policies
 
     def _get_applicable_policies(self) -> List[Policy]:
         """
@@ -28,43 +219,86 @@ class PolicyEvaluator:
           3. It is a *global* policy — i.e. it has **no** agents and **no**
              roles assigned at all (applies to everyone).
 
-        Bug fix: the previous implementation used
-          ``Q(agents__isnull=True, roles__isnull=True)``
-        on ManyToManyFields.  On an M2M, ``__isnull=True`` does NOT mean
-        "no related objects exist" — it means "the join table contains a row
-        with a NULL FK", which never happens.  A policy with zero agents
-        assigned produces *no* rows in the join table, so the isnull filter
-        never matched any global policy, causing every request to hit the
-        hard-coded DENY default with reason "No applicable policy found".
-
-        The correct idiom is to exclude policies that have *any* explicit
-        agent or role assignment, which is done here by filtering the global
-        set separately and combining with a union.
+        All three tests are expressed as EXISTS subqueries against the M2M
+        through tables, so the whole thing is ONE query with no joins in
+        the outer plan. The previous union of a targeted and a global
+        queryset cost a UNION + DISTINCT, and joining the M2M tables
+        directly would duplicate rows for policies matching both the agent
+        and several of its roles (the reason the DISTINCT existed).
+
+        The validity predicates (time window, max_calls headroom) are part
+        of the query, so expired or exhausted policies never leave the
+        database and the validity indexes can serve them.
         """
-        from django.db.models import Q
+        from django.db.models import Exists, F, OuterRef, Prefetch, Q
 
-        role_ids = self.agent.roles.values_list("id", flat=True)
+        from .models import PolicyCondition
 
-        # Policies aimed directly at this agent or its roles.
-        targeted = Policy.objects.filter(
-            Q(is_active=True),
-            Q(agents=self.agent) | Q(roles__in=role_ids),
-        )
+        now = timezone.now()
+        role_ids = _role_ids_for(self.agent)
 
-        # Policies with no agent or role assignments — truly global policies.
-        global_policies = Policy.objects.filter(is_active=True).exclude(
-            agents__isnull=False
-        ).exclude(
-            roles__isnull=False
+        has_agents = Exists(
+            Policy.agents.through.objects.filter(policy_id=OuterRef("pk"))
+        )
+        has_roles = Exists(
+            Policy.roles.through.objects.filter(policy_id=OuterRef("pk"))
+        )
+        targets_agent = Exists(
+            Policy.agents.through.objects.filter(
+                policy_id=OuterRef("pk"), agent_id=self.agent.pk
+            )
+        )
+        # role_ids comes from the per-agent cache, so the common rebuild
+        # costs no roles query at all.
+        targets_role = Exists(
+            Policy.roles.through.objects.filter(
+                policy_id=OuterRef("pk"), role_id__in=role_ids
+            )
         )
 
         policies = (
-            (targeted | global_policies)
-            .distinct()
+            Policy.objects.filter(is_active=True)
+            .annotate(
+                _has_agents=has_agents,
+                _has_roles=has_roles,
+                _targets_agent=targets_agent,
+                _targets_role=targets_role,
+            )
+            .filter(
+                Q(_targets_agent=True)
+                | Q(_targets_role=True)
+                # Global policy: no explicit agent or role assignments.
+                | (Q(_has_agents=False) & Q(_has_roles=False))
+            )
+            # Same predicates as Policy.is_valid_now(), pushed into SQL.
+            # max_calls of 0 means unlimited, matching the falsy check in
+            # is_valid_now().
+            .filter(
+                Q(valid_from__isnull=True) | Q(valid_from__lte=now),
+                Q(valid_until__isnull=True) | Q(valid_until__gte=now),
+                Q(max_calls__isnull=True) | Q(max_calls=0)
+                | Q(calls_made__lt=F("max_calls")),
+            )
             .order_by("-priority")
+            # Evaluation never touches description or the audit timestamps;
+            # only() keeps the large TEXT column out of every fetch.
+            .only(
+                "id", "name", "effect", "resources", "priority",
+                "max_calls", "calls_made", "valid_from", "valid_until",
+            )
+            # One bulk conditions query instead of an exists() + all() pair
+            # per policy inside the evaluate loop, fetching just the three
+            # columns condition compilation reads.
+            .prefetch_related(
+                Prefetch(
+                    "conditions",
+                    queryset=PolicyCondition.objects.only(
+                        "field", "operator", "value"
+                    ),
+                )
+            )
         )
-
-        return [p for p in policies if p.is_valid_now()]
+        return list(policies)
 
     def evaluate(
         self,
@@ -93,16 +327,15 @@ class PolicyEvaluator:
         Tuple[decision, policy, reason]
         """
         context = context or {}
-        start_time = timezone.now()
+        start_ns = time.perf_counter_ns()
 
         decision: str = PolicyEffect.DENY
         applying_policy: Optional[Policy] = None
         reason = "No applicable policy found"
 
-        for policy in self.applicable_policies:
-            if not self._resource_matches(policy.resources, resource):
-                continue
-
+        # Only policies whose resource patterns can match — the index did
+        # the pattern work, so the loop is conditions + effect only.
+        for policy in self._candidate_policies(resource):
             if not self._evaluate_conditions(policy, context):
                 continue
 
@@ -114,9 +347,21 @@ class PolicyEvaluator:
             if policy.effect == PolicyEffect.DENY:
                 break
 
-        elapsed_ms = int(
-            (timezone.now() - start_time).microseconds / 1000
-        )  # microseconds → ms, cast to int (field is IntegerField)
+        # Charge the quota before logging, so the logged decision is the
+        # one actually returned. consume_quota is atomic across workers;
+        # when it refuses (the counter raced to zero after the validity
+        # pre-filter), the policy no longer applies and we fall back to
+        # the default deny.
+        if applying_policy and decision in (PolicyEffect.ALLOW, PolicyEffect.DENY):
+            if not applying_policy.consume_quota():
+                decision = PolicyEffect.DENY
+                applying_policy = None
+                reason = "No applicable policy found"
+
+        # Monotonic clock, and the full duration — the old
+        # timedelta.microseconds read dropped whole seconds, silently
+        # capping reported latency at 999 ms.
+        elapsed_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
         self._log_decision(
             resource=resource,
@@ -128,78 +373,87 @@ class PolicyEvaluator:
             execution_time_ms=elapsed_ms,
         )
 
-        if applying_policy and decision in (PolicyEffect.ALLOW, PolicyEffect.DENY):
-            applying_policy.increment_calls()
-
         return decision, applying_policy, reason
 
     # ------------------------------------------------------------------
     # Matching helpers
     # ------------------------------------------------------------------
 
-    def _resource_matches(self, policy_resources: List[str], requested_resource: str) -> bool:
-        for pattern in policy_resources:
-            if pattern == requested_resource:
-                return True
-            if pattern.endswith(":*") and requested_resource.startswith(pattern[:-2]):
-                return True
-            if any(c in pattern for c in ("*", "?", "[")):
-                regex_pattern = pattern.replace("*", ".*").replace("?", ".")
-                if re.match(f"^{regex_pattern}$", requested_resource):
-                    return True
-        return False
+    @staticmethod
+    def _compile_condition(condition) -> "Callable[[Any], bool]":
+        """
+        Turn one PolicyCondition into a closure over its pre-processed
+        right-hand value. Numeric bounds are cast, list memberships become
+        frozensets and regexes are compiled once; conditions with values
+        that cannot be prepared evaluate to the same False the old
+        per-call try/except produced.
+        """
+        op = condition.operator
+        right = condition.value
+        if op == "eq":
+            return lambda v: v == right
+        if op == "neq":
+            return lambda v: v != right
+        if op in ("gt", "lt"):
+            try:
+                bound = float(right)
+            except (TypeError, ValueError):
+                return lambda v: False
+            if op == "gt":
+                return lambda v: float(v) > bound
+            return lambda v: float(v) < bound
+        if op == "contains":
+            return lambda v: right in v if isinstance(v, (str, list)) else False
+        if op == "not_contains":
+            return lambda v: right not in v if isinstance(v, (str, list)) else True
+        if op in ("in", "not_in"):
+            if not isinstance(right, list):
+                return (lambda v: False) if op == "in" else (lambda v: True)
+            try:
+                members = frozenset(right)
+            except TypeError:
+                members = tuple(right)
+            if op == "in":
+                return lambda v: v in members
+            return lambda v: v not in members
+        if op == "between":
+            if isinstance(right, list) and len(right) == 2:
+                low, high = right
+                return lambda v: low <= v <= high
+            return lambda v: False
+        if op == "regex":
+            try:
+                pattern = re.compile(str(right))
+            except re.error:
+                return lambda v: False
+            return lambda v: bool(pattern.match(str(v)))
+        return lambda v: False
 
     def _evaluate_conditions(self, policy: Policy, context: Dict[str, Any]) -> bool:
-        if not policy.conditions.exists():
+        compiled = self._compiled_conditions.get(policy.pk, ())
+        if not compiled:
             return True
-        for condition in policy.conditions.all():
-            value = self._get_nested_value(context, condition.field)
+        for path, check in compiled:
+            value = self._get_nested_value(context, path)
             if value is None:
                 return False
-            if not self._evaluate_operator(condition.operator, value, condition.value):
+            try:
+                if not check(value):
+                    return False
+            except (ValueError, TypeError):
                 return False
         return True
 
-    def _get_nested_value(self, data: Dict, path: str) -> Any:
-        keys = path.split(".")
+    def _get_nested_value(self, data: Dict, path: Tuple[str, ...]) -> Any:
+        """Walk a pre-split dotted path; None on any missing segment."""
         value = data
-        for key in keys:
+        for key in path:
             if isinstance(value, dict):
                 value = value.get(key)
             else:
                 return None
         return value
 
-    def _evaluate_operator(self, operator: str, left: Any, right: Any) -> bool:
-        try:
-            if operator == "eq":
-                return left == right
-            elif operator == "neq":
-                return left != right
-            elif operator == "gt":
-                return float(left) > float(right)
-            elif operator == "lt":
-                return float(left) < float(right)
-            elif operator == "contains":
-                return right in left if isinstance(left, (str, list)) else False
-            elif operator == "not_contains":
-                return right not in left if isinstance(left, (str, list)) else True
-            elif operator == "in":
-                return left in right if isinstance(right, list) else False
-            elif operator == "not_in":
-                return left not in right if isinstance(right, list) else True
-            elif operator == "between":
-                return (
-                    right[0] <= left <= right[1]
-                    if isinstance(right, list) and len(right) == 2
-                    else False
-                )
-            elif operator == "regex":
-                return bool(re.match(right, str(left)))
-        except (ValueError, TypeError):
-            return False
-        return False
-
     def _log_decision(
         self,
         resource: str,
@@ -211,24 +465,30 @@ class PolicyEvaluator:
         request_data: Dict[str, Any] = None,
     ) -> None:
         """
-        Persist a ``PolicyAuditLog`` row.
+        Buffer a ``PolicyAuditLog`` row for the flush task.
 
         Only fields that exist on the model are written.  The old code passed
         ``context=`` as a kwarg which has no corresponding DB column, raising:
         ``TypeError: PolicyAuditLog() got unexpected keyword arguments: 'context'``
-        The context dict is now stored in ``request_data`` (a JSONField that
+        The context dict is stored in ``request_data`` (a JSONField that
         *is* on the model) so the evaluation context is still auditable.
+
+        The row itself goes through the Redis buffer in audit.py instead of
+        a synchronous INSERT per evaluation; tasks.flush_audit_logs writes
+        batches with one bulk_create.
         """
-        PolicyAuditLog.objects.create(
-            agent=self.agent,
-            policy=policy,
-            resource=resource,
-            action=action,
-            decision=decision,
-            reason=reason,
-            request_data=request_data or {},
-            execution_time_ms=execution_time_ms,
-        )
+        from .audit import enqueue_audit_log
+
+        enqueue_audit_log({
+            "agent_id": str(self.agent.pk),
+            "policy_id": str(policy.pk) if policy else None,
+            "resource": resource,
+            "action": action,
+            "decision": decision,
+            "reason": reason,
+            "request_data": request_data or {},
+            "execution_time_ms": execution_time_ms,
+        })
 
 
 # ---------------------------------------------------------------------------
@@ -255,7 +515,13 @@ def enforce_policy(resource=None, action=None):
                 # No agent identity on this request — skip policy check.
                 return view_func(request, *args, **kwargs)
 
-            evaluator = PolicyEvaluator(agent)
+            # One evaluator per request: nested decorated views and
+            # middleware share the instance (and its compiled matchers)
+            # instead of rebuilding it. Safe — a request has one agent.
+            evaluator = getattr(request, "_policy_evaluator", None)
+            if evaluator is None or evaluator.agent != agent:
+                evaluator = PolicyEvaluator.for_agent(agent)
+                request._policy_evaluator = evaluator
             decision, policy, reason = evaluator.evaluate(
                 resource=resource or request.path,
                 action=action or request.method.lower(),
@@ -1,12 +1,23 @@
+import copy
+import fnmatch
+import hashlib
 import uuid
+import orjson
+from django.core.cache import cache
+from django.db import transaction
+from django.shortcuts import get_object_or_404
 from rest_framework import views, viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
-from .models import Policy, PolicyCondition, PolicyAssignment, PolicyAuditLog
+from .audit import enqueue_audit_log
+from .models import Policy, PolicyCondition, PolicyAssignment, PolicyAuditLog, PolicyEffect
+from .signals import get_policy_version
 from .serializers import (
-    PolicySerializer, 
+    PolicySerializer,
+    PolicyListSerializer,
+    PolicyLightSerializer,
     PolicyConditionSerializer,
     PolicyAssignmentSerializer,
     PolicyAuditLogSerializer,
@@ -14,6 +25,7 @@ from .serializers import (
 )
 from .utils import PolicyEvaluator
 from apps.agent_registry.models import Agent
+from apps.agent_registry.utils import get_agent
 
 
 class PolicyViewSet(viewsets.ModelViewSet):
@@ -27,7 +39,24 @@ class PolicyViewSet(viewsets.ModelViewSet):
     filterset_fields = ['is_active', 'effect', 'risk_level']
     search_fields = ['name', 'description']
     ordering_fields = ['priority', 'created_at', 'name']
-    
+
+    def get_queryset(self):
+        # Fixed query count regardless of policy count: the M2M rows come
+        # from three prefetches and created_by from a join, instead of
+        # per-policy lookups during serialization.
+        return (
+            self.queryset
+            .select_related('created_by')
+            .prefetch_related('agents', 'roles', 'conditions')
+        )
+
+    def get_serializer_class(self):
+        # Lists render related objects as pk lists; the detail view keeps
+        # the fully nested serializers.
+        if self.action == 'list':
+            return PolicyListSerializer
+        return super().get_serializer_class()
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     
@@ -42,25 +71,66 @@ class PolicyViewSet(viewsets.ModelViewSet):
         
         # Create a temporary evaluator
         agent_id = serializer.validated_data.get('agent_id')
-        try:
-            agent = Agent.objects.get(id=agent_id)
-        except Agent.DoesNotExist:
+        # Evaluation only needs the pk (role ids come from the M2M);
+        # skip fetching the rest of the agent row. first() keeps the
+        # not-found path out of exception handling.
+        agent = Agent.objects.only('id').filter(id=agent_id).first()
+        if agent is None:
             return Response(
                 {'error': 'Agent not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        evaluator = PolicyEvaluator(agent)
-        
-        # Only consider this single policy
-        evaluator.applicable_policies = [policy]
-        
-        decision, _, reason = evaluator.evaluate(
-            resource=serializer.validated_data['resource'],
-            action=serializer.validated_data['action'],
-            context=serializer.validated_data.get('context', {})
-        )
-        
+        resource = serializer.validated_data['resource']
+        req_action = serializer.validated_data['action']
+        context = serializer.validated_data.get('context', {})
+
+        if policy.is_constant:
+            # No conditions — the decision is the policy's effect whenever
+            # it covers the resource and is currently valid, so the whole
+            # evaluator build (resource index, condition compilation) can
+            # be skipped. The audit entry and call counter are kept in
+            # step with the evaluator path.
+            applying = None
+            decision = PolicyEffect.DENY
+            reason = "No applicable policy found"
+            if policy.is_valid_now() and any(
+                fnmatch.fnmatch(resource, pattern) for pattern in policy.resources
+            ):
+                # consume_quota is the atomic charge; a refusal means the
+                # counter raced to zero and the policy no longer applies,
+                # leaving the default deny in place.
+                if policy.effect not in (
+                    PolicyEffect.ALLOW, PolicyEffect.DENY
+                ) or policy.consume_quota():
+                    applying = policy
+                    decision = policy.effect
+                    reason = (
+                        f"Policy '{policy.name}' applied with effect {policy.effect}"
+                    )
+            enqueue_audit_log({
+                'agent_id': str(agent.pk),
+                'policy_id': str(applying.pk) if applying else None,
+                'resource': resource,
+                'action': req_action,
+                'decision': decision,
+                'reason': reason,
+                'request_data': context,
+                'execution_time_ms': 0,
+            })
+        else:
+            # Only this single policy is considered; passing it at
+            # construction skips the applicable-policies lookup a bare
+            # PolicyEvaluator(agent) would run. A fresh instance is used
+            # (not for_agent) because the restricted policy list is
+            # specific to this call.
+            evaluator = PolicyEvaluator(agent, policies=[policy])
+            decision, _, reason = evaluator.evaluate(
+                resource=resource,
+                action=req_action,
+                context=context,
+            )
+
         return Response({
             'policy_id': policy.id,
             'policy_name': policy.name,
@@ -73,21 +143,46 @@ class PolicyViewSet(viewsets.ModelViewSet):
         """
         Duplicate an existing policy.
         """
-        original = self.get_object()
-        
-        # Copy the policy
-        new_policy = Policy.objects.get(pk=original.pk)
-        new_policy.pk = None
-        new_policy.id = uuid.uuid4()
-        new_policy.name = f"{original.name} (Copy)"
-        new_policy.created_by = request.user
-        new_policy.calls_made = 0
-        new_policy.save()
-        
-        # Copy conditions
-        new_policy.conditions.set(original.conditions.all())
+        # The whole copy runs in one transaction with the source row
+        # locked, so a concurrent update (or second duplicate) of the same
+        # policy can't interleave with the read-copy-write. Plain
+        # select_for_update rather than skip_locked: skipping a locked row
+        # would surface as a bogus 404 to the second caller, while waiting
+        # out the short copy is correct — and other readers never block
+        # either way.
+        with transaction.atomic():
+            original = get_object_or_404(
+                Policy.objects.select_for_update(), pk=pk
+            )
+
+            # Copy the policy in memory — the locked fetch already read the
+            # row, so a second SELECT of the same pk is pure waste.
+            new_policy = copy.copy(original)
+            new_policy.pk = None
+            new_policy._state.adding = True
+            new_policy.id = uuid.uuid4()
+            new_policy.name = f"{original.name} (Copy)"
+            new_policy.created_by = request.user
+            new_policy.calls_made = 0
+            new_policy.save()
+
+            # Copy conditions by inserting through-table rows directly:
+            # .set() reads the full condition objects and diffs against the
+            # (empty) existing set, while this is one values_list SELECT and
+            # one bulk INSERT.
+            through = Policy.conditions.through
+            through.objects.bulk_create(
+                [
+                    through(policy_id=new_policy.id, policycondition_id=cid)
+                    for cid in original.conditions.values_list('id', flat=True)
+                ],
+                ignore_conflicts=True,
+            )
         
-        serializer = self.get_serializer(new_policy)
+        # The client only needs a handle on the copy — the full serializer
+        # would re-query and render agents/roles/conditions for a policy
+        # the caller just derived from one it already has.
+        serializer = PolicyLightSerializer(new_policy)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
@@ -104,6 +199,11 @@ class PolicyAssignmentViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['policy', 'agent', 'role']
 
+    def get_queryset(self):
+        # The serializer renders policy/agent/role/assigned_by names per
+        # row; join them up front instead of one query each per assignment.
+        return self.queryset.select_related('policy', 'agent', 'role', 'assigned_by')
+
 
 class PolicyAuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -114,13 +214,24 @@ class PolicyAuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['agent', 'decision', 'resource']
-    ordering_fields = ['-created_at']
+    ordering_fields = ['created_at']
+    # Explicit default so paginated listings always carry a stable,
+    # index-backed order (newest first) even without an ?ordering= param.
+    ordering = ['-created_at']
     
     def get_queryset(self):
-        # Users can only see logs for agents they own
+        # Users can only see logs for agents they own. Rows come back as
+        # values() dicts — the listing is read-only, so there is no point
+        # paying model __init__ per row; the joined agent/policy names ride
+        # along in the same query for the serializer.
+        queryset = PolicyAuditLog.objects.values(
+            'id', 'agent', 'agent__name', 'policy', 'policy__name',
+            'resource', 'action', 'request_data', 'decision', 'reason',
+            'ip_address', 'user_agent', 'execution_time_ms', 'created_at',
+        )
         if self.request.user.is_staff:
-            return PolicyAuditLog.objects.all()
-        return PolicyAuditLog.objects.filter(agent__owner=self.request.user)
+            return queryset
+        return queryset.filter(agent__owner=self.request.user)
 
 
 class PolicyCheckView(views.APIView):
@@ -128,31 +239,87 @@ class PolicyCheckView(views.APIView):
     Check if an agent can perform an action.
     """
     permission_classes = [permissions.IsAuthenticated]
-    
+
+    # Identical checks (same agent, resource, action and context) repeat in
+    # bursts — e.g. a workflow probing the same tool per step. Decisions are
+    # memoized for a short window, keyed on the policy-set version so any
+    # policy write invalidates every cached decision immediately.
+    DECISION_CACHE_TTL_SECONDS = 60
+
     def post(self, request):
         agent_id = request.data.get('agent_id')
         resource = request.data.get('resource')
         action = request.data.get('action')
         context = request.data.get('context', {})
-        
+
+        # Reject malformed ids before touching the database — a bad UUID
+        # otherwise surfaces as a ValidationError (500) from the field cast.
         try:
-            agent = Agent.objects.get(id=agent_id, owner=request.user)
-        except Agent.DoesNotExist:
+            agent_id = uuid.UUID(str(agent_id))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'agent_id must be a valid UUID'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Memoized owner-scoped lookup — repeated checks for the same agent
+        # within the memo's TTL skip the query entirely (see
+        # agent_registry.utils.get_agent).
+        agent = get_agent(agent_id, request.user.pk)
+        if agent is None:
             return Response(
                 {'error': 'Agent not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
-        
-        evaluator = PolicyEvaluator(agent)
-        decision, policy, reason = evaluator.evaluate(resource, action, context)
-        
-        return Response({
+
+        fingerprint = hashlib.sha256(
+            orjson.dumps(context, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+        cache_key = (
+            f"policy_decision:{agent.pk}:{get_policy_version()}:"
+            f"{resource}:{action}:{fingerprint}"
+        )
+
+        cached = cache.get(cache_key)
+        if cached is not None:
+            decision, policy_id, policy_name, reason = cached
+            # Every check is audited, cached or not — the memo skips the
+            # evaluation, never the compliance trail.
+            enqueue_audit_log({
+                'agent_id': str(agent.pk),
+                'policy_id': policy_id,
+                'resource': resource,
+                'action': action,
+                'decision': decision,
+                'reason': reason,
+                'request_data': context,
+                'execution_time_ms': 0,
+            })
+        else:
+            evaluator = PolicyEvaluator.for_agent(agent)
+            decision, policy, reason = evaluator.evaluate(resource, action, context)
+            policy_id = str(policy.id) if policy else None
+            policy_name = policy.name if policy else None
+            # Quota-limited policies are never memoized: each application
+            # counts against max_calls, and a cached ALLOW would keep
+            # passing after the quota ran out.
+            if policy is None or not policy.max_calls:
+                cache.set(
+                    cache_key,
+                    (decision, policy_id, policy_name, reason),
+                    self.DECISION_CACHE_TTL_SECONDS,
+                )
+
+        # The timestamp is display-only metadata — ship it as a header
+        # instead of paying DRF's datetime rendering in the JSON body.
+        response = Response({
             'agent_id': agent.id,
             'resource': resource,
             'action': action,
             'decision': decision,
-            'policy_id': policy.id if policy else None,
-            'policy_name': policy.name if policy else None,
+            'policy_id': policy_id,
+            'policy_name': policy_name,
             'reason': reason,
-            'timestamp': timezone.now(),
-        })
\ No newline at end of file
+        })
+        response['X-Decision-Time'] = timezone.now().isoformat()
+        return response
\ No newline at end of file
@@ -0,0 +1,20 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer backed by orjson.
+
+    orjson serializes dict-heavy payloads (request logs, conversations,
+    tool schemas) several times faster than stdlib json and handles
+    datetime/UUID natively; anything else (e.g. Decimal) falls back to str.
+    """
+    media_type = "application/json"
+    format = "json"
+    charset = None  # orjson emits UTF-8 bytes
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=str)
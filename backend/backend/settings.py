@@ -64,6 +64,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.agent_gateway.middleware.AgentRequestLogMiddleware',
     'django_prometheus.middleware.PrometheusAfterMiddleware',
 ]
 
@@ -141,6 +142,17 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 
 REST_FRAMEWORK = {
+    # orjson-backed JSON handling — 3-5x faster on the dict-heavy payloads
+    # this API serves (request logs, conversations, tool schemas).
+    'DEFAULT_RENDERER_CLASSES': (
+        'backend.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'backend.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
@@ -187,4 +199,17 @@ VECTOR_STORE_PATH = os.path.join(BASE_DIR, 'chroma_db')
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'django-db'
 CELERY_ACCEPT_CONTENT = ['json']
-CELERY_TASK_SERIALIZER = 'json'
\ No newline at end of file
+CELERY_TASK_SERIALIZER = 'json'
+
+CELERY_BEAT_SCHEDULE = {
+    # Drain the Redis-buffered agent request logs into the DB in batches.
+    'flush-agent-request-logs': {
+        'task': 'apps.agent_gateway.tasks.flush_request_logs',
+        'schedule': 1.0,
+    },
+    # Drain the Redis-buffered policy audit logs into the DB in batches.
+    'flush-policy-audit-logs': {
+        'task': 'apps.policy_engine.tasks.flush_audit_logs',
+        'schedule': 1.0,
+    },
+}
\ No newline at end of file